@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import binascii
+import functools
 import hashlib
 import os
+import re
 from pathlib import Path, PurePosixPath
 from typing import Dict, Iterable
 
@@ -18,30 +21,54 @@ except ModuleNotFoundError as exc:  # pragma: no cover - import guard
         "PyYAML is required for egg hashing. Install with 'pip install PyYAML'"
     ) from exc
 
+# Parse with libyaml when available.  Dumping deliberately stays on the
+# pure-Python ``safe_dump`` so ``hashes.yaml`` bytes (and therefore their
+# signatures) do not depend on whether PyYAML was built with libyaml.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+try:  # Optional, faster digest for local caches that need no SHA256 contract.
+    from blake3 import blake3 as _blake3
+except ImportError:  # pragma: no cover - optional dependency
+    _blake3 = None
+
+HAVE_BLAKE3 = _blake3 is not None
+
+# ``hashlib.file_digest`` is only available on Python 3.11+.
+_file_digest = getattr(hashlib, "file_digest", None)
+
 
 _CHUNK_SIZE = 8192
+_BLAKE3_CHUNK_SIZE = 1 << 20
+
+# ``write_hashes_file`` emits ``key: digest`` lines directly when both sides are
+# guaranteed to round-trip through YAML as plain strings.  Keys must start with
+# a letter or underscore (so they never resolve to numbers) and must not be one
+# of YAML 1.1's boolean/null words; digests must contain at least one letter so
+# they are never read back as integers.
+_PLAIN_KEY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_.-]*(?:/[A-Za-z0-9_.-]+)*")
+_PLAIN_DIGEST_RE = re.compile(r"(?=[0-9a-f]*[a-f])[0-9a-f]{64}")
+# ``safe_dump`` switches to the explicit ``? key`` form for keys of 123
+# characters or more, so longer keys are left to it to stay byte-identical.
+_MAX_PLAIN_KEY_LEN = 122
+_YAML_RESERVED_WORDS = frozenset(
+    {"y", "n", "yes", "no", "true", "false", "on", "off", "null"}
+)
 
 # Default private key seed for demonstration/testing purposes
 DEFAULT_PRIVATE_KEY = os.getenv("EGG_PRIVATE_KEY", "egg-signing-key").encode()
 
 
-def _signing_key(key: bytes | None = None) -> SigningKey:
-    """Return a ``SigningKey`` derived from ``key``."""
-    if key is None:
-        key = DEFAULT_PRIVATE_KEY
+@functools.lru_cache(maxsize=32)
+def _derive_signing_key(key: bytes) -> SigningKey:
+    """Return a ``SigningKey`` for raw ``key`` bytes, caching the result."""
     if len(key) != 32:
         key = hashlib.sha256(key).digest()
     return SigningKey(key)
 
 
-def _verify_key(key: bytes | None = None) -> VerifyKey:
-    """Return a ``VerifyKey`` derived from ``key``."""
-    if key is None:
-        env = os.getenv("EGG_PUBLIC_KEY")
-        if env is not None:
-            key = env.encode()
-        else:
-            return _signing_key().verify_key
+@functools.lru_cache(maxsize=32)
+def _derive_verify_key(key: bytes) -> VerifyKey:
+    """Return a ``VerifyKey`` for raw ``key`` bytes, caching the result."""
     if len(key) == 64:
         try:
             key = bytes.fromhex(key.decode())
@@ -52,15 +79,63 @@ def _verify_key(key: bytes | None = None) -> VerifyKey:
     return VerifyKey(key)
 
 
+# The default key never changes for the lifetime of the module, so derive it
+# once at import instead of on every signature or verification.
+_DEFAULT_SIGNING_KEY = _derive_signing_key(DEFAULT_PRIVATE_KEY)
+
+
+def _signing_key(key: bytes | None = None) -> SigningKey:
+    """Return a ``SigningKey`` derived from ``key``."""
+    if key is None:
+        return _DEFAULT_SIGNING_KEY
+    return _derive_signing_key(key)
+
+
+def _verify_key(key: bytes | None = None) -> VerifyKey:
+    """Return a ``VerifyKey`` derived from ``key``."""
+    if key is None:
+        env = os.getenv("EGG_PUBLIC_KEY")
+        if env is None:
+            return _DEFAULT_SIGNING_KEY.verify_key
+        key = env.encode()
+    return _derive_verify_key(key)
+
+
 def sha256_file(path: Path) -> str:
     """Return SHA256 hex digest of a file."""
     h = hashlib.sha256()
     with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= _CHUNK_SIZE:
+            # Small files (typical cell sources) fit in one read; hash them in
+            # a single call instead of paying for the chunked loop.
+            h.update(f.read())
+            return h.hexdigest()
+        # Larger files are read rather than ``mmap``ed: a mapped file that is
+        # truncated while hashing raises SIGBUS and kills the interpreter.
+        if _file_digest is not None:
+            # Python 3.11+: run the read/update loop in C.
+            return _file_digest(f, "sha256").hexdigest()
         for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
             h.update(chunk)
     return h.hexdigest()
 
 
+def blake3_file(path: Path) -> str:
+    """Return BLAKE3 hex digest of a file.
+
+    Requires the optional ``blake3`` package; check :data:`HAVE_BLAKE3` first.
+    """
+    if _blake3 is None:
+        raise ModuleNotFoundError(
+            "blake3 is required for blake3_file. Install with 'pip install blake3'"
+        )
+    h = _blake3()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_BLAKE3_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
 def compute_hashes(
     files: Iterable[Path], *, base_dir: Path | None = None
 ) -> Dict[str, str]:
@@ -82,33 +157,73 @@ def compute_hashes(
     Raises
     ------
     ValueError
-        If duplicate keys are encountered.
+        If duplicate keys are encountered or a file lies outside ``base_dir``.
     """
 
-    hashes: Dict[str, str] = {}
+    # Normalize ``base_dir`` once; the per-file containment check below is a
+    # purely lexical ``relative_to`` and touches no filesystem metadata.
+    base = Path(base_dir) if base_dir else None
+
+    # Resolve every key before hashing so duplicates are rejected without
+    # reading any file contents.
+    entries: list[tuple[str, Path]] = []
+    seen: set[str] = set()
     for f in files:
         path = Path(f)
-        name = str(path.relative_to(base_dir)) if base_dir else path.name
-        if name in hashes:
+        if base is None:
+            name = path.name
+        else:
+            try:
+                name = str(path.relative_to(base))
+            except ValueError:
+                raise ValueError(f"{path} is not within base_dir {base}") from None
+        if name in seen:
             raise ValueError(f"Duplicate file basename: {name}")
-        hashes[name] = sha256_file(path)
-    return hashes
+        seen.add(name)
+        entries.append((name, path))
+
+    return {name: sha256_file(path) for name, path in entries}
 
 
-def write_hashes_file(hashes: Dict[str, str], path: Path) -> None:
-    """Write a mapping of file hashes to ``path`` as YAML."""
-    # ``yaml.safe_dump`` does not guarantee deterministic key order unless
-    # ``sort_keys`` is explicitly set.  Relying on the default can result in
-    # nondeterministic builds across PyYAML versions.  Explicitly enable key
-    # sorting so the output is stable regardless of environment.
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(hashes, f, sort_keys=True)
+def _is_plain_entry(name: str, digest: str) -> bool:
+    """Return ``True`` if ``name: digest`` can be written without quoting."""
+    return (
+        len(name) <= _MAX_PLAIN_KEY_LEN
+        and _PLAIN_KEY_RE.fullmatch(name) is not None
+        and name.lower() not in _YAML_RESERVED_WORDS
+        and _PLAIN_DIGEST_RE.fullmatch(digest) is not None
+    )
+
+
+def write_hashes_file(hashes: Dict[str, str], path: Path) -> bytes:
+    """Write a mapping of file hashes to ``path`` as YAML and return its bytes.
+
+    Entries are always written in sorted key order so the output is
+    byte-for-byte deterministic.  Typical mappings of relative paths to hex
+    digests are emitted directly as ``key: digest`` lines; anything that would
+    need YAML quoting falls back to ``yaml.safe_dump``.  The file is written
+    in binary mode, so the returned bytes are exactly what is on disk and can
+    be passed straight to :func:`sign_hashes`.
+    """
+    if hashes and all(_is_plain_entry(k, v) for k, v in hashes.items()):
+        text = "".join(f"{k}: {hashes[k]}\n" for k in sorted(hashes))
+    else:
+        # ``yaml.safe_dump`` does not guarantee deterministic key order unless
+        # ``sort_keys`` is explicitly set.  Relying on the default can result
+        # in nondeterministic builds across PyYAML versions.  Explicitly
+        # enable key sorting so the output is stable regardless of
+        # environment.
+        text = yaml.safe_dump(hashes, sort_keys=True)
+    data = text.encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    return data
 
 
 def load_hashes(path: Path) -> Dict[str, str]:
     """Load a YAML file of hashes."""
     with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YAML_LOADER)
 
     if data is None:
         return {}
@@ -122,11 +237,20 @@ def load_hashes(path: Path) -> Dict[str, str]:
     return data
 
 
-def sign_hashes(path: Path, *, private_key: bytes | None = None) -> str:
-    """Return an Ed25519 signature of ``path``."""
-    sk = _signing_key(private_key)
-    signature = sk.sign(path.read_bytes()).signature
-    return signature.hex()
+def _sign_bytes(data: bytes, private_key: bytes | None = None) -> bytes:
+    """Return the raw 64-byte Ed25519 signature of ``data``."""
+    return _signing_key(private_key).sign(data).signature
+
+
+def sign_hashes(data: Path | bytes, *, private_key: bytes | None = None) -> str:
+    """Return an Ed25519 signature of ``data``.
+
+    ``data`` may be the path to a ``hashes.yaml`` file or its raw bytes when
+    the contents are already in memory, which avoids re-reading the file.
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        data = Path(data).read_bytes()
+    return binascii.hexlify(_sign_bytes(bytes(data), private_key)).decode("ascii")
 
 
 def verify_hashes(directory: Path, hashes: Dict[str, str]) -> bool:
@@ -153,15 +277,22 @@ def verify_archive(archive: Path, *, public_key: bytes | None = None) -> bool:
     """
     vk = _verify_key(public_key)
     with zipfile.ZipFile(archive) as zf:
-        for name in zf.namelist():
+        # Read the central directory listing once and reuse it for every
+        # check below.  ``ZipFile.infolist`` may contain duplicate names, so
+        # reject those before indexing the entries by name.
+        infos = zf.infolist()
+        members = {info.filename: info for info in infos}
+        if len(members) != len(infos):
+            return False
+        for name in members:
             p = PurePosixPath(name)
             if p.is_absolute() or ".." in p.parts:
                 return False
+        # ``hashes.yaml`` is read once: the same bytes are checked against the
+        # signature and then parsed, so it is never re-read from the archive.
         try:
-            with zf.open("hashes.yaml") as f:
-                hashes_bytes = f.read()
-            with zf.open("hashes.sig") as f:
-                signature = bytes.fromhex(f.read().decode().strip())
+            hashes_bytes = zf.read(members["hashes.yaml"])
+            signature = binascii.unhexlify(zf.read(members["hashes.sig"]).strip())
         except (KeyError, ValueError):
             return False
 
@@ -171,7 +302,7 @@ def verify_archive(archive: Path, *, public_key: bytes | None = None) -> bool:
             return False
 
         try:
-            hashes = yaml.safe_load(hashes_bytes) or {}
+            hashes = yaml.load(hashes_bytes, Loader=_YAML_LOADER) or {}
         except yaml.YAMLError:
             return False
         if not isinstance(hashes, dict):
@@ -180,27 +311,20 @@ def verify_archive(archive: Path, *, public_key: bytes | None = None) -> bool:
             if not isinstance(key, str) or not isinstance(value, str):
                 return False
 
-        for name, expected in hashes.items():
-            try:
-                with zf.open(name) as fh:
-                    digest = hashlib.sha256()
-                    for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
-                        digest.update(chunk)
-            except KeyError:
-                return False
-            if digest.hexdigest() != expected:
-                return False
-
-        # Ensure no unverified files are present in the archive and there are no
-        # duplicate entries. ``ZipFile.namelist`` returns a list which may
-        # contain duplicates, so check that before converting to a ``set``.
-        names_list = zf.namelist()
-        if len(names_list) != len(set(names_list)):
-            return False
-        names = set(names_list)
+        # Ensure no unverified files are present and nothing listed is missing
+        # before spending time hashing member contents.
+        names = set(members)
         names.discard("hashes.yaml")
         names.discard("hashes.sig")
         if names != set(hashes.keys()):
             return False
 
+        for name, expected in hashes.items():
+            with zf.open(members[name]) as fh:
+                digest = hashlib.sha256()
+                for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            if digest.hexdigest() != expected:
+                return False
+
     return True
@@ -6,6 +6,7 @@ Defines dataclasses for cells and the top-level manifest and validates
 
 from __future__ import annotations
 
+import os
 import re
 from dataclasses import dataclass
 from datetime import date, datetime
@@ -21,14 +22,35 @@ except ModuleNotFoundError as exc:  # pragma: no cover - import guard
         "PyYAML is required to load egg manifests. Install with 'pip install PyYAML'"
     ) from exc
 
+# Prefer the libyaml-backed loader when PyYAML was built with it; it parses
+# the same documents as ``SafeLoader`` but runs in C.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass
+# Parsed manifest documents keyed by absolute path.  Entries are validated
+# against the file's current bytes rather than its mtime, which on many
+# filesystems is too coarse to notice a quick same-size rewrite.
+_MANIFEST_CACHE: dict[str, tuple[bytes, dict]] = {}
+_MANIFEST_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
 class Cell:
     """A single code cell entry in the manifest."""
 
+    __slots__ = ("language", "source")
+
     language: str
     source: str
 
+    # Frozen dataclasses with hand-written ``__slots__`` cannot be restored by
+    # the default ``copy``/``pickle`` protocol, which assigns attributes.
+    def __getstate__(self) -> tuple[str, str]:
+        return (self.language, self.source)
+
+    def __setstate__(self, state: tuple[str, str]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 @dataclass
 class Manifest:
@@ -44,12 +66,19 @@ class Manifest:
     license: str | None = None
 
 
-def _normalize_source(path: str | Path, manifest_dir: Path) -> str:
-    """Normalize a cell source path and ensure it stays within ``manifest_dir``."""
+def _normalize_source(
+    path: str | Path, manifest_dir: Path, *, resolved: bool = False
+) -> str:
+    """Normalize a cell source path and ensure it stays within ``manifest_dir``.
+
+    Pass ``resolved=True`` when ``manifest_dir`` is already resolved so callers
+    normalizing many cells resolve the directory only once.
+    """
     p = Path(path)
     if p.is_absolute():
         raise ValueError(f"Absolute source paths are not allowed: {path}")
-    manifest_dir = manifest_dir.resolve()
+    if not resolved:
+        manifest_dir = manifest_dir.resolve()
     abs_path = (manifest_dir / p).resolve(strict=False)
     if not _is_relative_to(abs_path, manifest_dir):
         raise ValueError(f"Source path escapes manifest directory: {path}")
@@ -57,14 +86,29 @@ def _normalize_source(path: str | Path, manifest_dir: Path) -> str:
 
 
 def _load_manifest_yaml(path: Path | str) -> dict:
-    """Load raw manifest YAML data and ensure the root is a mapping."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    """Load raw manifest YAML data and ensure the root is a mapping.
+
+    Parsed documents are cached per absolute path and reused for as long as
+    the file's bytes are unchanged, so repeated loads of the same manifest
+    (e.g. by the runtime fetcher and then the precompute agent) skip YAML
+    parsing.  The returned mapping is shared and must not be mutated.
+    """
+    raw = Path(path).read_bytes()
+    key = os.path.abspath(path)
+    cached = _MANIFEST_CACHE.get(key)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+
+    data = yaml.load(raw.decode("utf-8"), Loader=_YAML_LOADER)
 
     if data is None:
         data = {}
     if not isinstance(data, dict):
         raise ValueError("Manifest root must be a mapping")
+
+    if len(_MANIFEST_CACHE) >= _MANIFEST_CACHE_SIZE:
+        _MANIFEST_CACHE.pop(next(iter(_MANIFEST_CACHE)))
+    _MANIFEST_CACHE[key] = (raw, data)
     return data
 
 
@@ -248,7 +292,7 @@ def load_manifest(path: Path | str) -> Manifest:
             raise ValueError(f"Cell #{i} 'language' must be a string")
         if not isinstance(cell["source"], str):
             raise ValueError(f"Cell #{i} 'source' must be a string")
-        normalized = _normalize_source(cell["source"], manifest_dir)
+        normalized = _normalize_source(cell["source"], manifest_dir, resolved=True)
         if normalized in cell_sources:
             raise ValueError(f"Duplicate cell source: {normalized}")
         cell_sources.add(normalized)
@@ -3,15 +3,84 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import subprocess
 import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Callable, List
 
 from .manifest import load_manifest
-from .utils import get_lang_command, load_plugins, validate_lang_command
-from .hashing import sha256_file, write_hashes_file, load_hashes
+from .utils import (
+    get_lang_command,
+    json_dumps,
+    json_loads,
+    load_plugins,
+    validate_lang_command,
+)
+from .hashing import (
+    HAVE_BLAKE3,
+    blake3_file,
+    sha256_file,
+    write_hashes_file,
+    load_hashes,
+)
+
+
+# ``precompute_hashes.yaml`` stays the source of truth.  A JSON sidecar holding
+# the same mapping lets the common "nothing changed" run skip YAML parsing; it
+# is only trusted while its format version and the stamp of the YAML file it
+# was written alongside still match.
+_CACHE_SIDECAR_SUFFIX = ".json"
+_CACHE_SIDECAR_VERSION = 1
+
+
+def _load_cache(cache_path: Path) -> dict[str, str]:
+    """Return the precompute cache at ``cache_path``, preferring its sidecar."""
+
+    stamp = _output_stamp(cache_path)
+    if stamp is None:
+        return {}
+    sidecar = cache_path.with_suffix(_CACHE_SIDECAR_SUFFIX)
+    try:
+        with open(sidecar, "rb") as f:
+            data = json_loads(f.read())
+    except (OSError, ValueError):
+        data = None
+    if (
+        isinstance(data, dict)
+        and data.get("version") == _CACHE_SIDECAR_VERSION
+        and data.get("source") == stamp
+        and isinstance(data.get("hashes"), dict)
+    ):
+        return data["hashes"]
+    hashes = load_hashes(cache_path)
+    _write_cache_sidecar(hashes, cache_path)
+    return hashes
+
+
+def _write_cache_sidecar(hashes: dict[str, str], cache_path: Path) -> None:
+    """Write the JSON sidecar for ``cache_path``; failures are not fatal."""
+
+    data = {
+        "version": _CACHE_SIDECAR_VERSION,
+        "source": _output_stamp(cache_path),
+        "hashes": hashes,
+    }
+    try:
+        with open(cache_path.with_suffix(_CACHE_SIDECAR_SUFFIX), "wb") as f:
+            f.write(json_dumps(data))
+    except OSError:  # pragma: no cover - read-only directory
+        pass
+
+
+def _save_cache(hashes: dict[str, str], cache_path: Path) -> None:
+    """Write ``precompute_hashes.yaml`` and refresh its JSON sidecar."""
+
+    write_hashes_file(hashes, cache_path)
+    _write_cache_sidecar(hashes, cache_path)
 
 
 def _hash_command(cmd: List[str]) -> str:
@@ -24,6 +93,85 @@ def _hash_command(cmd: List[str]) -> str:
     return h.hexdigest()
 
 
+def _source_digest(src: Path) -> str:
+    """Return the cache digest for a cell source file.
+
+    Uses BLAKE3, tagged as ``blake3:<hex>``, when the optional ``blake3``
+    package is installed and plain SHA256 hex otherwise.  Entries written with
+    the other algorithm simply miss the cache once.
+    """
+
+    if HAVE_BLAKE3:
+        return f"blake3:{blake3_file(src)}"
+    return sha256_file(src)
+
+
+def _output_stamp(out_file: Path) -> str | None:
+    """Return a ``<size>-<mtime_ns>`` stamp for ``out_file`` or ``None``."""
+
+    try:
+        st = out_file.stat()
+    except FileNotFoundError:
+        return None
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def _run_cell(
+    cmd: List[str], src: Path, out_file: Path, err_file: Path, timeout: float | None
+) -> None:
+    """Run a single cell, writing stdout to ``out_file``."""
+    try:
+        with open(out_file, "w", encoding="utf-8") as out:
+            proc = subprocess.run(
+                cmd,
+                stdout=out,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=timeout,
+            )
+    except subprocess.TimeoutExpired as exc:
+        out_file.unlink(missing_ok=True)
+        raise RuntimeError(f"Timed out precomputing {src}") from exc
+    if proc.returncode != 0:
+        err_file.write_text(proc.stderr, encoding="utf-8")
+        raise RuntimeError(f"Failed to precompute {src}; see {err_file}")
+    err_file.unlink(missing_ok=True)
+
+
+def _run_cells(
+    jobs: List[tuple[List[str], Path, Path, Path]],
+    timeout: float | None,
+    on_success: Callable[[int], None],
+) -> None:
+    """Run ``jobs`` on a thread pool bounded by the number of CPUs.
+
+    Each cell is an independent subprocess and ``subprocess.run`` releases the
+    GIL while waiting, so threads are enough to overlap them.  ``on_success``
+    is called with the index of every job that completes cleanly.  Results are
+    collected in manifest order so the first failing cell is the one
+    reported; cells that have not started yet are cancelled on failure.
+    """
+    if len(jobs) == 1:
+        _run_cell(*jobs[0], timeout)
+        on_success(0)
+        return
+
+    def _run(index: int) -> None:
+        _run_cell(*jobs[index], timeout)
+        on_success(index)
+
+    workers = min(len(jobs), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run, i) for i in range(len(jobs))]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
 def precompute_cells(
     manifest_path: Path | str, timeout: float | None = None
 ) -> List[Path]:
@@ -33,6 +181,12 @@ def precompute_cells(
     containing the program output. If execution fails a companion
     ``<source>.err`` file is written containing stderr. The path of each
     created file is returned.
+
+    All cells are validated before any of them runs.  Cells whose source,
+    command and previous output are unchanged since the last run are skipped;
+    the rest run concurrently.  ``precompute_hashes.yaml`` is read once and
+    written once, including when a cell fails, so completed cells are not
+    re-run next time.
     """
     load_plugins()
     manifest_path = Path(manifest_path)
@@ -40,50 +194,58 @@ def precompute_cells(
     manifest_dir = manifest_path.parent.resolve()
 
     cache_path = manifest_dir / "precompute_hashes.yaml"
-    prev_hashes = load_hashes(cache_path) if cache_path.exists() else {}
+    prev_hashes = _load_cache(cache_path)
+    # Only entries whose outputs are known to be current are recorded, so a
+    # failed or interrupted cell is re-run on the next invocation.
     new_hashes: dict[str, str] = {}
+    hashes_lock = threading.Lock()
 
     outputs: List[Path] = []
+    pending: List[tuple[List[str], Path, Path, Path]] = []
+    pending_entries: List[tuple[str, str, Path]] = []
+    # Command lookup, validation, the ``PATH`` search and the command digest
+    # depend only on the language, so resolve each language once per run.
+    commands: dict[str, tuple[List[str], str]] = {}
     for cell in manifest.cells:
         lang = cell.language.lower()
-        cmd = get_lang_command(lang)
-        if cmd is None:
-            raise ValueError(f"Unsupported language: {cell.language}")
-        cmd = validate_lang_command(cmd, lang)
-        if shutil.which(cmd[0]) is None:
-            raise FileNotFoundError(
-                f"Required runtime '{cmd[0]}' for {cell.language} cells not found"
-            )
+        resolved = commands.get(lang)
+        if resolved is None:
+            cmd = get_lang_command(lang)
+            if cmd is None:
+                raise ValueError(f"Unsupported language: {cell.language}")
+            cmd = validate_lang_command(cmd, lang)
+            if shutil.which(cmd[0]) is None:
+                raise FileNotFoundError(
+                    f"Required runtime '{cmd[0]}' for {cell.language} cells not found"
+                )
+            resolved = commands[lang] = (cmd, _hash_command(cmd))
+        cmd, cmd_digest = resolved
         src_rel = Path(cell.source)
         src = manifest_dir / src_rel
-        digest = sha256_file(src)
-        cmd_digest = _hash_command(cmd)
+        digest = _source_digest(src)
         cache_value = f"{digest}:{cmd_digest}"
-        new_hashes[src_rel.as_posix()] = cache_value
         out_file = src.with_name(src.name + ".out")
         err_file = src.with_name(src.name + ".err")
+        outputs.append(out_file)
+        # The entry also records the output's size and mtime so a truncated or
+        # edited ``.out`` file is regenerated rather than trusted.
         prev_value = prev_hashes.get(src_rel.as_posix())
-        if prev_value == cache_value and out_file.exists():
-            outputs.append(out_file)
+        stamp = _output_stamp(out_file)
+        if stamp is not None and prev_value == f"{cache_value}:{stamp}":
+            new_hashes[src_rel.as_posix()] = prev_value
             continue
-        try:
-            with open(out_file, "w", encoding="utf-8") as out:
-                proc = subprocess.run(
-                    cmd + [str(src)],
-                    stdout=out,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    timeout=timeout,
-                )
-        except subprocess.TimeoutExpired as exc:
-            out_file.unlink(missing_ok=True)
-            raise RuntimeError(f"Timed out precomputing {src}") from exc
-        if proc.returncode != 0:
-            err_file.write_text(proc.stderr, encoding="utf-8")
-            outputs.extend([out_file, err_file])
-            raise RuntimeError(f"Failed to precompute {src}; see {err_file}")
-        err_file.unlink(missing_ok=True)
-        outputs.append(out_file)
+        pending.append((cmd + [str(src)], src, out_file, err_file))
+        pending_entries.append((src_rel.as_posix(), cache_value, out_file))
+
+    def _record(index: int) -> None:
+        key, value, out_file = pending_entries[index]
+        entry = f"{value}:{_output_stamp(out_file)}"
+        with hashes_lock:
+            new_hashes[key] = entry
 
-    write_hashes_file(new_hashes, cache_path)
+    try:
+        if pending:
+            _run_cells(pending, timeout, _record)
+    finally:
+        _save_cache(new_hashes, cache_path)
     return outputs
@@ -9,28 +9,285 @@ environment variable is unset.
 from __future__ import annotations
 
 import hashlib
+import http.client
+import io
 import logging
 import os
-from urllib.parse import quote
-from urllib.request import Request, urlopen
+import re
+import ssl
+import threading
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from urllib.parse import quote, urljoin, urlsplit
+from urllib.request import Request
 from urllib.error import URLError, HTTPError
 import socket
 from pathlib import Path, PurePosixPath
-from typing import List
+from typing import Dict, List
 
+from .hashing import sha256_file
 from .manifest import load_manifest_dependencies
-from .utils import _is_relative_to
+from .utils import _is_relative_to, json_dumps, json_loads
 
 
-_CHUNK_SIZE = 8192
+# Read responses in large blocks to keep syscalls per image low.
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
 _PROGRESS_INTERVAL = 1 << 20  # 1 MiB
 _CACHE_DIR_NAME = ".egg_runtime"
 _CACHE_MARKER_NAME = ".managed-by-egg-runtime-fetcher"
 _CACHE_MARKER_CONTENTS = "Managed by egg.runtime_fetcher; safe to delete.\n"
 
+_POOL_MAXSIZE = 8
+_MAX_DOWNLOAD_WORKERS = 8
+_MAX_REDIRECTS = 10
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+# Image names made only of ``/``-separated segments starting with an
+# alphanumeric character are already normalized and cannot contain ``..``, so
+# they skip the slower ``PurePosixPath`` checks.
+_SIMPLE_IMAGE_NAME_RE = re.compile(
+    r"[A-Za-z0-9][A-Za-z0-9._-]*(?:/[A-Za-z0-9][A-Za-z0-9._-]*)*"
+)
+# Characters ``quote`` leaves alone plus the three reserved ones common in
+# image references, which ``_quote_image`` escapes with a translate table.
+_PLAIN_IMAGE_REF_RE = re.compile(r"[A-Za-z0-9._~/:@+-]*")
+_IMAGE_REF_QUOTE = str.maketrans({":": "%3A", "@": "%40", "+": "%2B"})
+
 logger = logging.getLogger(__name__)
 
 
+class _ConnectionPool:
+    """Keep idle HTTP(S) connections per ``(scheme, host)`` for reuse.
+
+    ``urllib.request`` closes the socket after every response, so each image
+    download would pay a fresh TCP (and TLS) handshake.  Reusing keep-alive
+    connections amortizes that across all dependencies of a manifest.
+    """
+
+    def __init__(self, maxsize: int = _POOL_MAXSIZE) -> None:
+        self._maxsize = maxsize
+        self._idle: Dict[tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    def acquire(
+        self, scheme: str, host: str, timeout: float | None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """Return a connection for ``scheme://host`` and whether it was reused."""
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        return self.connect(scheme, host, timeout), False
+
+    def connect(
+        self, scheme: str, host: str, timeout: float | None
+    ) -> http.client.HTTPConnection:
+        """Return a new, not yet connected, connection for ``scheme://host``."""
+        if scheme == "https":
+            with self._lock:
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(
+                host, timeout=timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, timeout=timeout)
+
+    def release(self, scheme: str, host: str, conn: http.client.HTTPConnection) -> None:
+        """Return ``conn`` to the pool, closing it if the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self._maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+
+_POOL = _ConnectionPool()
+
+# Downloads currently in progress, keyed by absolute destination (whose
+# ``.tmp`` and ``.range`` files are what concurrent calls would race on).
+# Each entry records the image, registry and expected digest being fetched.
+_INFLIGHT: Dict[str, tuple[tuple, Future[Path]]] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Executor shared by every ``fetch_runtime_blocks`` call so concurrent
+# manifests queue behind one bounded set of download threads.
+_FETCH_POOL: ThreadPoolExecutor | None = None
+_FETCH_POOL_LOCK = threading.Lock()
+
+
+class _PooledResponse:
+    """File-like HTTP response that hands its connection back when closed."""
+
+    def __init__(
+        self,
+        resp: http.client.HTTPResponse,
+        conn: http.client.HTTPConnection,
+        scheme: str,
+        host: str,
+        url: str,
+    ) -> None:
+        self._resp = resp
+        self._conn: http.client.HTTPConnection | None = conn
+        self._scheme = scheme
+        self._host = host
+        self.url = url
+        self.status = self.code = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._resp.read(amt)
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if not self._resp.isclosed() and self._resp.length == 0:
+            self._resp.read()  # bodiless response; marks it complete
+        reusable = self._resp.isclosed() and not self._resp.will_close
+        self._resp.close()
+        if reusable:
+            _POOL.release(self._scheme, self._host, conn)
+        else:
+            conn.close()
+
+    def __enter__(self) -> "_PooledResponse":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def urlopen(req: Request, *, timeout: float | None = None) -> _PooledResponse:
+    """Open ``req`` over a pooled keep-alive connection.
+
+    Mirrors :func:`urllib.request.urlopen` for the requests issued here:
+    redirects are followed, non-2xx responses raise ``HTTPError`` and
+    connection failures raise ``URLError``.  Redirects to schemes other than
+    ``http``/``https`` are refused with ``HTTPError``.  Requests for
+    non-HTTP schemes or proxied hosts are handed to
+    ``urllib.request.urlopen`` as the original ``req``, never as a redirect
+    target, so its own redirect checks apply.
+    """
+    url = req.full_url
+    method = req.get_method()
+    headers = dict(req.header_items())
+    for _ in range(_MAX_REDIRECTS + 1):
+        current = Request(url, headers=headers, method=method)
+        scheme, host = current.type, current.host
+        proxies = urllib.request.getproxies()
+        if scheme not in ("http", "https") or (
+            scheme in proxies and not urllib.request.proxy_bypass(host)
+        ):
+            return urllib.request.urlopen(req, timeout=timeout)
+
+        conn, reused = _POOL.acquire(scheme, host, timeout)
+        try:
+            try:
+                conn.request(method, current.selector, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once
+                # on a fresh one.
+                conn = _POOL.connect(scheme, host, timeout)
+                conn.request(method, current.selector, headers=headers)
+                resp = conn.getresponse()
+        except OSError as exc:
+            conn.close()
+            raise URLError(exc) from exc
+        except http.client.HTTPException:
+            # Malformed replies (``BadStatusLine``, ``LineTooLong``...) are not
+            # ``OSError``; close the socket before propagating them unchanged.
+            conn.close()
+            raise
+
+        wrapped = _PooledResponse(resp, conn, scheme, host, url)
+        if resp.status in _REDIRECT_CODES and resp.headers.get("Location"):
+            body = wrapped.read()
+            wrapped.close()
+            target = urljoin(url, resp.headers["Location"])
+            if urlsplit(target).scheme.lower() not in ("http", "https"):
+                raise HTTPError(
+                    url,
+                    resp.status,
+                    f"{resp.reason} - Redirection to url '{target}' is not allowed",
+                    resp.headers,
+                    io.BytesIO(body),
+                )
+            url = target
+            if resp.status == 303:
+                method = "GET"
+            continue
+        if not 200 <= resp.status < 300:
+            # Error bodies are small; buffer them so the connection goes back
+            # to the pool now rather than whenever the ``HTTPError`` is freed.
+            body = wrapped.read()
+            wrapped.close()
+            raise HTTPError(
+                url, resp.status, resp.reason, resp.headers, io.BytesIO(body)
+            )
+        return wrapped
+    raise URLError(f"Too many redirects for {req.full_url}")
+
+
+def _quote_image(image: str) -> str:
+    """Return ``image`` percent-encoded for use in a registry URL.
+
+    Equivalent to ``urllib.parse.quote(image)``.  Typical references only
+    need ``:``, ``@`` and ``+`` escaped, which a C-level ``str.translate``
+    handles; anything else goes through ``quote``.
+    """
+    if _PLAIN_IMAGE_REF_RE.fullmatch(image):
+        return image.translate(_IMAGE_REF_QUOTE)
+    return quote(image)
+
+
+def _fetch_pool() -> ThreadPoolExecutor:
+    """Return the shared download executor, creating it on first use.
+
+    Its size comes from ``EGG_FETCH_WORKERS`` and defaults to
+    ``_MAX_DOWNLOAD_WORKERS``.
+    """
+    global _FETCH_POOL
+    with _FETCH_POOL_LOCK:
+        if _FETCH_POOL is None:
+            env_workers = os.getenv("EGG_FETCH_WORKERS")
+            workers = _MAX_DOWNLOAD_WORKERS
+            if env_workers:
+                try:
+                    workers = int(env_workers)
+                except ValueError as exc:
+                    raise ValueError("EGG_FETCH_WORKERS must be an integer") from exc
+                if workers < 1:
+                    raise ValueError("EGG_FETCH_WORKERS must be at least 1")
+            _FETCH_POOL = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="egg-fetch"
+            )
+        return _FETCH_POOL
+
+
 def _get_registry_url() -> str | None:
     """Return the container registry base URL from env or config file."""
     url = os.getenv("EGG_REGISTRY_URL")
@@ -72,6 +329,91 @@ def _ensure_cache_dir(cache_dir: Path) -> Path:
     return cache_dir
 
 
+def _validators_path(dest: Path) -> Path:
+    """Return the sidecar file holding HTTP cache validators for ``dest``."""
+    return dest.with_suffix(".etag")
+
+
+def _range_validator_path(tmp: Path) -> Path:
+    """Return the sidecar holding the ``If-Range`` validator for ``tmp``."""
+    return tmp.with_suffix(".range")
+
+
+def _load_range_validator(tmp: Path) -> str | None:
+    """Return the validator recorded when ``tmp`` was started, if any."""
+    try:
+        with open(_range_validator_path(tmp), "rb") as f:
+            data = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    value = data.get("if_range") if isinstance(data, dict) else None
+    return value if isinstance(value, str) else None
+
+
+def _save_range_validator(tmp: Path, headers: object) -> None:
+    """Record a strong ``ETag`` or ``Last-Modified`` usable as ``If-Range``.
+
+    Weak entity tags cannot be used with ``If-Range``; without a usable
+    validator the sidecar is removed so the partial file is never resumed.
+    """
+    path = _range_validator_path(tmp)
+    get = getattr(headers, "get", None)
+    value = None
+    if get is not None:
+        etag = get("ETag")
+        if isinstance(etag, str) and not etag.startswith("W/"):
+            value = etag
+        elif isinstance(get("Last-Modified"), str):
+            value = get("Last-Modified")
+    if value is None:
+        path.unlink(missing_ok=True)
+        return
+    with open(path, "wb") as f:
+        f.write(json_dumps({"if_range": value}))
+
+
+def _discard_partial(tmp: Path) -> None:
+    """Remove a partial download and its ``If-Range`` sidecar."""
+    tmp.unlink(missing_ok=True)
+    _range_validator_path(tmp).unlink(missing_ok=True)
+
+
+def _load_validators(dest: Path) -> Dict[str, str]:
+    """Return conditional request headers recorded for ``dest``."""
+    try:
+        with open(_validators_path(dest), "rb") as f:
+            data = json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    headers: Dict[str, str] = {}
+    if isinstance(data, dict):
+        if isinstance(data.get("etag"), str):
+            headers["If-None-Match"] = data["etag"]
+        if isinstance(data.get("last_modified"), str):
+            headers["If-Modified-Since"] = data["last_modified"]
+    return headers
+
+
+def _save_validators(dest: Path, headers: object) -> None:
+    """Record ``ETag``/``Last-Modified`` from ``headers`` next to ``dest``."""
+    path = _validators_path(dest)
+    get = getattr(headers, "get", None)
+    data = {}
+    if get is not None:
+        for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+            value = get(header)
+            if isinstance(value, str):
+                data[key] = value
+    try:
+        if data:
+            with open(path, "wb") as f:
+                f.write(json_dumps(data))
+        else:
+            path.unlink(missing_ok=True)
+    except OSError as exc:  # pragma: no cover - cache dir not writable
+        logger.debug("[runtime_fetcher] could not record validators: %s", exc)
+
+
 def _download_container(
     image: str,
     dest: Path,
@@ -80,6 +422,7 @@ def _download_container(
     *,
     expected_digest: str | None = None,
     user_agent: str = "egg-runtime-fetcher",
+    resume: bool = True,
 ) -> Path:
     """Download ``image`` from ``base_url`` to ``dest``.
 
@@ -97,6 +440,23 @@ def _download_container(
     user_agent : str, optional
         ``User-Agent`` header sent with the download request. Defaults to
         ``"egg-runtime-fetcher"``.
+    resume : bool, optional
+        Keep the partial ``.tmp`` file when the transfer is interrupted by a
+        network error and continue it with an HTTP ``Range`` request on the
+        next call.  The request carries the partial response's ``ETag`` or
+        ``Last-Modified`` as ``If-Range`` so a changed image is resent whole;
+        partial files without such a validator are discarded instead.
+        Defaults to ``True``.
+
+    Without ``expected_digest`` an existing ``dest`` is revalidated with a
+    conditional request using the ``ETag``/``Last-Modified`` values stored in
+    ``dest.with_suffix(".etag")``; a ``304 Not Modified`` reply keeps the
+    cached file instead of downloading it again.
+
+    Concurrent calls for the same destination never download at once.  A
+    caller asking for the same image, registry and digest as the download in
+    flight waits for it and receives its result or exception; any other
+    caller waits for it to finish and then checks ``dest`` again.
 
     A ``ValueError`` is raised if ``dest`` resolves outside its parent
     directory.  This prevents a malicious symlink from redirecting the
@@ -105,6 +465,52 @@ def _download_container(
     exception.
     """
 
+    key = os.path.abspath(dest)
+    request = (image, base_url, expected_digest)
+    while True:
+        with _INFLIGHT_LOCK:
+            entry = _INFLIGHT.get(key)
+            if entry is None:
+                future: Future[Path] = Future()
+                _INFLIGHT[key] = (request, future)
+                break
+        other, pending = entry
+        if other == request:
+            return pending.result()
+        wait([pending])
+    try:
+        result = _download_container_once(
+            image,
+            dest,
+            base_url,
+            timeout,
+            expected_digest=expected_digest,
+            user_agent=user_agent,
+            resume=resume,
+        )
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT[key]
+
+
+def _download_container_once(
+    image: str,
+    dest: Path,
+    base_url: str,
+    timeout: float | None,
+    *,
+    expected_digest: str | None,
+    user_agent: str,
+    resume: bool,
+) -> Path:
+    """Perform the download described by :func:`_download_container`."""
+
     if timeout is None:
         env_timeout = os.getenv("EGG_DOWNLOAD_TIMEOUT")
         if env_timeout:
@@ -121,13 +527,10 @@ def _download_container(
         raise ValueError(f"Download path escapes manifest directory: {dest}")
 
     dest.parent.mkdir(parents=True, exist_ok=True)
+    conditional: Dict[str, str] = {}
     if dest.is_file():
         if expected_digest is not None:
-            h = hashlib.sha256()
-            with open(dest, "rb") as fh:
-                for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
-                    h.update(chunk)
-            digest = h.hexdigest()
+            digest = sha256_file(dest)
             if digest == expected_digest:
                 logger.debug(
                     "[runtime_fetcher] using cached %s (digest verified)", dest
@@ -135,29 +538,146 @@ def _download_container(
                 return dest
             logger.info("[runtime_fetcher] cached %s digest mismatch; refreshing", dest)
         else:
+            conditional = _load_validators(dest)
             logger.info("[runtime_fetcher] refreshing %s (no expected digest)", dest)
 
-    url = f"{base_url.rstrip('/')}/{quote(image)}.img"
+    url = f"{base_url.rstrip('/')}/{_quote_image(image)}.img"
     logger.info("[runtime_fetcher] downloading %s -> %s", url, dest)
     tmp = dest.with_suffix(".tmp")
-    req = Request(url, headers={"User-Agent": user_agent})
-    try:
-        with urlopen(req, timeout=timeout) as resp, open(tmp, "wb") as fh:
-            # ``urlopen`` responses provide a ``headers`` mapping. Test
-            # doubles used in this project may omit the attribute, so fall back
-            # to an empty mapping to avoid ``AttributeError``.
-            content_length = getattr(resp, "headers", {}).get("Content-Length")
-            try:
-                total = int(content_length) if content_length is not None else None
-            except (ValueError, TypeError):
-                total = None
+    offset = 0
+    if_range = None
+    if resume:
+        try:
+            offset = tmp.stat().st_size
+        except FileNotFoundError:
+            pass
+        if offset:
+            # Only resume when the partial file can be tied to the server's
+            # current version; otherwise a changed image would be spliced.
+            if_range = _load_range_validator(tmp)
+            if if_range is None:
+                _discard_partial(tmp)
+                offset = 0
+    while True:
+        headers = {"User-Agent": user_agent, **conditional}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = if_range
+        try:
+            resp_headers = _fetch_to_tmp(
+                Request(url, headers=headers),
+                tmp,
+                image,
+                offset,
+                timeout,
+                expected_digest,
+            )
+        except HTTPError as exc:
+            if exc.code == 416 and offset:
+                # The partial file no longer matches what the server has;
+                # start over with a full download.
+                logger.info("[runtime_fetcher] cannot resume %s; restarting", url)
+                _discard_partial(tmp)
+                offset = 0
+                continue
+            _discard_partial(tmp)
+            if exc.code == 304 and conditional:
+                logger.debug("[runtime_fetcher] %s not modified; using cache", dest)
+                return dest
+            raise RuntimeError(f"Failed to download {url}: {exc}") from exc
+        except (
+            URLError,
+            socket.timeout,
+            ConnectionError,
+            http.client.IncompleteRead,
+        ) as exc:
+            # Transport failures keep the partial ``.tmp`` so the next attempt
+            # can resume with a ``Range`` request.
+            if not resume:
+                _discard_partial(tmp)
+            raise RuntimeError(f"Failed to download {url}: {exc}") from exc
+        except BaseException:
+            # Verification failures and interrupts (including
+            # KeyboardInterrupt) leave no partial ``.tmp`` behind; ``dest`` is
+            # only ever replaced atomically below.
+            _discard_partial(tmp)
+            raise
+        break
+    tmp.replace(dest)
+    _range_validator_path(tmp).unlink(missing_ok=True)
+    _save_validators(dest, resp_headers)
+    return dest
 
-            h = hashlib.sha256()
-            transferred = 0
-            next_log = _PROGRESS_INTERVAL
 
+def _content_range(headers: object) -> tuple[int, int | None] | None:
+    """Parse ``Content-Range: bytes <start>-<end>/<total>`` from ``headers``."""
+    get = getattr(headers, "get", None)
+    value = get("Content-Range") if get is not None else None
+    if not isinstance(value, str):
+        return None
+    unit, _, spec = value.strip().partition(" ")
+    span, _, size = spec.partition("/")
+    start, _, _ = span.partition("-")
+    if unit != "bytes" or not start.isdigit():
+        return None
+    return int(start), int(size) if size.isdigit() else None
+
+
+def _fetch_to_tmp(
+    req: Request,
+    tmp: Path,
+    image: str,
+    offset: int,
+    timeout: float | None,
+    expected_digest: str | None,
+) -> object:
+    """Stream ``req`` into ``tmp`` and verify it; return the response headers.
+
+    When ``offset`` is non-zero the request carries ``Range`` and
+    ``If-Range`` headers and a ``206 Partial Content`` reply starting at
+    ``offset`` is appended to the existing partial file.  A ``206`` for any
+    other range raises ``RuntimeError``; other replies replace ``tmp`` from
+    scratch and record their validator for a later resume.
+    """
+    with urlopen(req, timeout=timeout) as resp:
+        # ``urlopen`` responses provide a ``headers`` mapping. Test
+        # doubles used in this project may omit the attribute, so fall back
+        # to an empty mapping to avoid ``AttributeError``.
+        resp_headers = getattr(resp, "headers", {})
+        content_length = resp_headers.get("Content-Length")
+        try:
+            total = int(content_length) if content_length is not None else None
+        except (ValueError, TypeError):
+            total = None
+
+        h = hashlib.sha256()
+        transferred = 0
+        status = getattr(resp, "status", None)
+        content_range = _content_range(resp_headers)
+        if status == 206:
+            if not offset or content_range is None or content_range[0] != offset:
+                raise RuntimeError(
+                    f"Unexpected partial response for {image}: requested byte "
+                    f"{offset}, got {resp_headers.get('Content-Range')!r}"
+                )
+            mode = "ab"
+            with open(tmp, "rb") as existing:
+                for chunk in iter(lambda: existing.read(_DOWNLOAD_CHUNK_SIZE), b""):
+                    h.update(chunk)
+            transferred = offset
+            if content_range is not None and content_range[1] is not None:
+                total = content_range[1]
+            elif total is not None:
+                total += offset
+            logger.info("[runtime_fetcher] resuming %s at byte %d", image, transferred)
+        else:
+            mode = "wb"
+            _save_range_validator(tmp, resp_headers)
+        next_log = (transferred // _PROGRESS_INTERVAL + 1) * _PROGRESS_INTERVAL
+
+        with open(tmp, mode) as fh:
             while True:
-                chunk = resp.read(_CHUNK_SIZE)
+                chunk = resp.read(_DOWNLOAD_CHUNK_SIZE)
                 if not chunk:
                     break
                 fh.write(chunk)
@@ -180,28 +700,40 @@ def _download_container(
                     while transferred >= next_log:
                         next_log += _PROGRESS_INTERVAL
 
-        if total is not None and transferred != total:
-            raise RuntimeError(
-                f"Incomplete download for {image}: expected {total} bytes, got {transferred}"
-            )
-        digest = h.hexdigest()
-        if expected_digest is not None and digest != expected_digest:
-            raise RuntimeError(
-                f"Checksum mismatch for {image}: expected {expected_digest} but got {digest}"
-            )
-    except (
-        HTTPError,
-        URLError,
-        socket.timeout,
-    ) as exc:  # pragma: no cover - network errors
-        tmp.unlink(missing_ok=True)
-        raise RuntimeError(f"Failed to download {url}: {exc}") from exc
-    except Exception:
-        tmp.unlink(missing_ok=True)
-        raise
-    else:
-        tmp.replace(dest)
-    return dest
+    if total is not None and transferred != total:
+        raise RuntimeError(
+            f"Incomplete download for {image}: expected {total} bytes, got {transferred}"
+        )
+    digest = h.hexdigest()
+    if expected_digest is not None and digest != expected_digest:
+        raise RuntimeError(
+            f"Checksum mismatch for {image}: expected {expected_digest} but got {digest}"
+        )
+    return resp_headers
+
+
+def _resolve_local_dependency(
+    manifest_dir: Path, rel: Path, parents: Dict[Path, Path]
+) -> Path:
+    """Return ``(manifest_dir / rel).resolve()`` reusing resolved parents.
+
+    ``manifest_dir`` must already be resolved.  ``Path.resolve`` walks every
+    component from the filesystem root, so resolving each dependency
+    separately repeats that walk for the manifest directory.  Instead each
+    distinct parent directory is resolved once via ``parents`` and only the
+    final component is checked; symlinks there, and paths containing ``..``,
+    still get a full resolve so symlink escapes are detected as before.
+    """
+
+    if not rel.name or ".." in rel.parts:
+        return (manifest_dir / rel).resolve(strict=False)
+    parent = parents.get(rel.parent)
+    if parent is None:
+        parent = parents[rel.parent] = (manifest_dir / rel.parent).resolve(strict=False)
+    candidate = parent / rel.name
+    if candidate.is_symlink():
+        return candidate.resolve(strict=False)
+    return candidate
 
 
 def fetch_runtime_blocks(manifest_path: Path | str) -> List[Path | str]:
@@ -244,6 +776,11 @@ def fetch_runtime_blocks(manifest_path: Path | str) -> List[Path | str]:
     safe_names: dict[str, str] = {}
     registry = _get_registry_url()
     cache_dir: Path | None = None
+    # Container downloads are deferred until every dependency has been
+    # validated and then fetched concurrently; each entry records the slot
+    # in ``resolved`` that receives the downloaded path.
+    downloads: list[tuple[int, str, Path]] = []
+    resolved_parents: Dict[Path, Path] = {}
 
     for dep in deps:
         if ":" in dep:
@@ -251,13 +788,14 @@ def fetch_runtime_blocks(manifest_path: Path | str) -> List[Path | str]:
                 raise ValueError(f"Invalid container image name: {dep}")
 
             image_name = dep.split(":", 1)[0]
-            posix = PurePosixPath(image_name)
-            if (
-                posix.is_absolute()
-                or posix.as_posix() != image_name
-                or any(part == ".." for part in posix.parts)
-            ):
-                raise ValueError(f"Invalid container image name: {dep}")
+            if not _SIMPLE_IMAGE_NAME_RE.fullmatch(image_name):
+                posix = PurePosixPath(image_name)
+                if (
+                    posix.is_absolute()
+                    or posix.as_posix() != image_name
+                    or any(part == ".." for part in posix.parts)
+                ):
+                    raise ValueError(f"Invalid container image name: {dep}")
 
             if registry:
                 if cache_dir is None:
@@ -275,15 +813,15 @@ def fetch_runtime_blocks(manifest_path: Path | str) -> List[Path | str]:
                     )
                 safe_names[safe] = dep
                 dest = (cache_dir / f"{safe}.img").resolve(strict=False)
+                # ``cache_dir`` was checked against ``manifest_dir`` above, so
+                # containment in the cache implies containment in the manifest
+                # directory; one check per dependency is enough.
                 if not _is_relative_to(dest, cache_dir):
                     raise ValueError(
                         f"Dependency path escapes manifest directory: {dep}"
                     )
-                if not _is_relative_to(dest, manifest_dir):
-                    raise ValueError(
-                        f"Dependency path escapes manifest directory: {dep}"
-                    )
-                resolved.append(_download_container(dep, dest, registry))
+                downloads.append((len(resolved), dep, dest))
+                resolved.append(dest)
             else:
                 resolved.append(dep)
                 logger.debug("[runtime_fetcher] Recorded container spec %s", dep)
@@ -291,7 +829,7 @@ def fetch_runtime_blocks(manifest_path: Path | str) -> List[Path | str]:
         p = Path(dep)
         if p.is_absolute():
             raise ValueError(f"Absolute dependency paths are not allowed: {dep}")
-        abs_path = (manifest_dir / p).resolve(strict=False)
+        abs_path = _resolve_local_dependency(manifest_dir, p, resolved_parents)
         if not _is_relative_to(abs_path, manifest_dir):
             raise ValueError(f"Dependency path escapes manifest directory: {dep}")
         if not abs_path.is_file():
@@ -299,4 +837,21 @@ def fetch_runtime_blocks(manifest_path: Path | str) -> List[Path | str]:
         resolved.append(abs_path)
         logger.debug("[runtime_fetcher] Fetched %s", abs_path)
 
+    if len(downloads) == 1:
+        idx, dep, dest = downloads[0]
+        resolved[idx] = _download_container(dep, dest, registry)
+    elif downloads:
+        pool = _fetch_pool()
+        futures = [
+            (idx, pool.submit(_download_container, dep, dest, registry))
+            for idx, dep, dest in downloads
+        ]
+        try:
+            for idx, fut in futures:
+                resolved[idx] = fut.result()
+        except BaseException:
+            for _, fut in futures:
+                fut.cancel()
+            raise
+
     return resolved
@@ -11,28 +11,80 @@ configuration file produced by :func:`build_microvm_image`.
 
 from __future__ import annotations
 
-import json
+import functools
 import logging
+import os
 import tempfile
 import subprocess
 import platform
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from .constants import SUPPORTED_PLATFORMS
 from pathlib import Path
 from typing import Dict, Callable
 
 from .manifest import Manifest
+from .utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+_MAX_BUILD_WORKERS = 8
+_WHICH_CACHE: Dict[str, str] = {}
+_ROOTFS_SIZE = 1 * 1024 * 1024  # 1MiB placeholder
+_CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
+@functools.lru_cache(maxsize=1)
+def _host_platform() -> str:
+    """Return ``platform.system()``, evaluated once per process."""
+    return platform.system()
+
+
+def _platform() -> str:
+    """Return the OS used for sandbox dispatch.
+
+    ``EGG_FORCE_OS`` overrides the detected host, which lets tests exercise
+    other platforms with ``monkeypatch.setenv`` instead of patching modules.
+    """
+    return os.environ.get("EGG_FORCE_OS") or _host_platform()
+
+
+def _which(name: str) -> str | None:
+    """Return ``shutil.which(name)``, remembering binaries that were found.
+
+    Misses are not cached, so a runtime installed while the process is
+    running is picked up on the next launch.
+    """
+    path = _WHICH_CACHE.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _WHICH_CACHE[name] = path
+    return path
+
 
 def check_platform() -> None:
     """Raise ``RuntimeError`` if running on an unsupported platform."""
-    current = platform.system()
+    current = _platform()
     if current not in SUPPORTED_PLATFORMS:
         raise RuntimeError(f"Unsupported platform: {current}")
 
 
+def _write_file(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data`` using raw ``os`` calls.
+
+    Image configs are tiny, so this skips the ``Path`` and buffered-file
+    layers and issues just ``open``/``write``/``close``.
+    """
+    fd = os.open(path, _CREATE_FLAGS | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
 def build_microvm_image(language: str, dest: Path) -> None:
     """Create a minimal Firecracker micro-VM image for ``language``.
 
@@ -48,35 +100,38 @@ def build_microvm_image(language: str, dest: Path) -> None:
         Directory where the image should be created.
     """
 
-    dest.mkdir(parents=True, exist_ok=True)
+    os.makedirs(dest, exist_ok=True)
+    root = os.fspath(dest)
+    kernel = os.path.join(root, "vmlinux")
+    rootfs = os.path.join(root, "rootfs.ext4")
 
-    kernel = dest / "vmlinux"
-    kernel.touch()
-    rootfs = dest / "rootfs.ext4"
-    with open(rootfs, "wb") as f:
-        f.truncate(1 * 1024 * 1024)  # 1MiB placeholder
+    os.close(os.open(kernel, _CREATE_FLAGS, 0o644))
+    fd = os.open(rootfs, _CREATE_FLAGS | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, _ROOTFS_SIZE)
+    finally:
+        os.close(fd)
 
     config = {
         "boot-source": {
-            "kernel_image_path": str(kernel),
+            "kernel_image_path": kernel,
             "boot_args": f"console=ttyS0 init=/usr/bin/{language}",
         },
         "drives": [
             {
                 "drive_id": "rootfs",
-                "path_on_host": str(rootfs),
+                "path_on_host": rootfs,
                 "is_root_device": True,
                 "is_read_only": False,
             }
         ],
     }
 
-    conf_json = dest / "microvm.json"
-    conf_json.write_text(json.dumps(config), encoding="utf-8")
-    conf_yaml = dest / "microvm.conf"
-    conf_yaml.write_text(
-        f"language: {language}\nkernel: {kernel.name}\nrootfs: {rootfs.name}\n",
-        encoding="utf-8",
+    conf_json = os.path.join(root, "microvm.json")
+    _write_file(conf_json, json_dumps(config))
+    _write_file(
+        os.path.join(root, "microvm.conf"),
+        f"language: {language}\nkernel: vmlinux\nrootfs: rootfs.ext4\n".encode(),
     )
     logger.debug("[sandboxer] wrote %s, %s and %s", conf_json, kernel, rootfs)
 
@@ -84,15 +139,16 @@ def build_microvm_image(language: str, dest: Path) -> None:
 def build_container_image(language: str, dest: Path) -> None:
     """Create a placeholder container image configuration for ``language``."""
 
-    dest.mkdir(parents=True, exist_ok=True)
+    os.makedirs(dest, exist_ok=True)
     config = {
         "language": language,
         "runtime": "container",
     }
-    conf_json = dest / "container.json"
-    conf_json.write_text(json.dumps(config), encoding="utf-8")
-    conf_yaml = dest / "container.conf"
-    conf_yaml.write_text(f"language: {language}\n", encoding="utf-8")
+    root = os.fspath(dest)
+    conf_json = os.path.join(root, "container.json")
+    _write_file(conf_json, json_dumps(config))
+    conf_yaml = os.path.join(root, "container.conf")
+    _write_file(conf_yaml, f"language: {language}\n".encode())
     logger.debug("[sandboxer] wrote %s and %s", conf_json, conf_yaml)
 
 
@@ -117,35 +173,48 @@ def prepare_images(
         function. Call the cleanup once the images are no longer needed.
     """
     check_platform()
-    system = platform.system()
+    system = _platform()
 
     def _noop() -> None:
         pass
 
     cleanup: Callable[[], None] = _noop
     if base_dir is None:
-        tmp = tempfile.TemporaryDirectory()
-        base = Path(tmp.name)
+        # A bare ``mkdtemp`` avoids ``TemporaryDirectory``'s weakref finalizer;
+        # the returned cleanup removes the tree directly.
+        tmp = tempfile.mkdtemp(prefix="egg-img-")
+        base = Path(tmp)
 
         def _cleanup() -> None:
-            tmp.cleanup()
+            shutil.rmtree(tmp, ignore_errors=True)
 
         cleanup = _cleanup
     else:
         base = Path(base_dir)
-    images: Dict[str, Path] = {}
-    for cell in manifest.cells:
-        lang = cell.language.lower()
-        if lang in images:
-            continue  # pragma: no cover
-        img_dir = base / f"{lang}-image"
-        if system == "Linux":
-            build_microvm_image(lang, img_dir)
-        else:
-            build_container_image(lang, img_dir)
+    build = build_microvm_image if system == "Linux" else build_container_image
 
+    def _build(lang: str) -> Path:
+        img_dir = base / f"{lang}-image"
+        build(lang, img_dir)
         logger.info("[sandboxer] prepared %s image at %s", lang, img_dir)
-        images[lang] = img_dir
+        return img_dir
+
+    # ``dict.fromkeys`` drops repeated languages while keeping manifest order.
+    langs = list(dict.fromkeys(cell.language.lower() for cell in manifest.cells))
+    try:
+        if len(langs) <= 1:
+            images = {lang: _build(lang) for lang in langs}
+        else:
+            # Each image is a handful of independent file writes, so building
+            # the languages on threads overlaps their I/O.
+            workers = min(_MAX_BUILD_WORKERS, len(langs))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                images = dict(zip(langs, ex.map(_build, langs)))
+    except BaseException:
+        # The caller never receives ``cleanup`` on failure, so remove any
+        # temporary directory here rather than leaking it.
+        cleanup()
+        raise
     return images, cleanup
 
 
@@ -186,19 +255,19 @@ def launch_container(image_dir: Path) -> subprocess.CompletedProcess:
     if not config.is_file():
         raise ValueError(f"missing container.json in {image_dir}")
     try:
-        data = json.loads(config.read_text())
-    except json.JSONDecodeError as exc:
+        data = json_loads(config.read_bytes())
+    except ValueError as exc:
         raise ValueError(f"invalid container.json in {image_dir}") from exc
     if "language" not in data:
         raise ValueError(f"container.json missing 'language' key in {image_dir}")
     language = data["language"]
 
-    if platform.system() == "Linux":
+    if _platform() == "Linux":
         runtime = "runc"
     else:
         runtime = "docker"
 
-    if shutil.which(runtime) is None:
+    if _which(runtime) is None:
         raise FileNotFoundError(
             f"'{runtime}' binary not found; please install {runtime} or ensure it is on PATH"
         )
@@ -1,17 +1,32 @@
 """Common helpers for path validation, command resolution, and plug-in loading.
 
 Provides ``_is_relative_to`` for safe path checks, ``get_lang_command`` for
-determining runtime commands, and ``load_plugins`` to discover plug-ins.
+determining runtime commands, ``load_plugins`` to discover plug-ins, and
+``json_loads``/``json_dumps`` for small JSON cache files.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
+import functools
 import os
 import shlex
 import sys
 import logging
 from importlib.metadata import entry_points
+from typing import Any
+
+try:  # Optional, faster JSON codecs for cache sidecars.
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+try:
+    import ujson as _ujson
+except ImportError:  # pragma: no cover - optional dependency
+    _ujson = None
+
+import json as _json
 
 __all__ = [
     "_is_relative_to",
@@ -19,6 +34,8 @@ __all__ = [
     "get_lang_command",
     "DEFAULT_LANG_COMMANDS",
     "load_plugins",
+    "json_loads",
+    "json_dumps",
 ]
 
 logger = logging.getLogger(__name__)
@@ -34,7 +51,19 @@ def _is_relative_to(path: Path, base: Path) -> bool:
     """Return True if *path* is relative to *base*.
 
     This provides a backport of ``Path.is_relative_to`` for Python 3.8.
+    The check is lexical; absolute POSIX-style paths are compared as strings,
+    which avoids building part tuples and raising for the negative case.
     """
+    p = os.path.normcase(os.fspath(path))
+    b = os.path.normcase(os.fspath(base))
+    if p == b:
+        return True
+    if not b.endswith(os.sep):
+        b += os.sep
+    if p.startswith(b):
+        return True
+    if p.startswith(os.sep) and b.startswith(os.sep):
+        return False
     try:
         path.relative_to(base)
         return True
@@ -42,6 +71,26 @@ def _is_relative_to(path: Path, base: Path) -> bool:
         return False
 
 
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON ``data`` using ``orjson`` or ``ujson`` when installed."""
+
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if _ujson is not None:
+        return _ujson.loads(data)
+    return _json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON, preferring ``orjson``/``ujson``."""
+
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    if _ujson is not None:
+        return _ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+    return _json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 DEFAULT_LANG_COMMANDS = {
     "python": [sys.executable],
     "r": ["Rscript"],
@@ -71,15 +120,29 @@ def validate_lang_command(cmd: object, lang: str) -> list[str]:
     return cmd
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_lang_override(lang: str, override: str) -> tuple[str, ...]:
+    """Split and validate an ``EGG_CMD_<LANG>`` override.
+
+    Results are cached by ``(lang, override)`` so repeated lookups for the same
+    environment value skip ``shlex`` parsing, while a changed value is simply a
+    cache miss.
+    """
+
+    return tuple(
+        validate_lang_command(
+            shlex.split(override),
+            f"{lang} (from EGG_CMD_{lang.upper()})",
+        )
+    )
+
+
 def get_lang_command(lang: str) -> list[str] | None:
     """Return the command list for ``lang`` respecting environment overrides."""
 
     override = os.getenv(f"EGG_CMD_{lang.upper()}")
     if override:
-        return validate_lang_command(
-            shlex.split(override),
-            f"{lang} (from EGG_CMD_{lang.upper()})",
-        )
+        return list(_parse_lang_override(lang, override))
     cmd = DEFAULT_LANG_COMMANDS.get(lang)
     if cmd is None:
         return None
@@ -9,8 +9,6 @@ import logging
 import subprocess
 import shutil
 from pathlib import Path
-import platform
-import importlib
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 import egg_cli  # noqa: E402
@@ -134,10 +132,9 @@ def test_hatch(monkeypatch, tmp_path, caplog, os_name, conf_file):
     def fake_run(cmd, check=True):
         calls.append(cmd)
 
-    monkeypatch.setattr(platform, "system", lambda: os_name)
     import egg.sandboxer as sandboxer
 
-    importlib.reload(sandboxer)
+    monkeypatch.setenv("EGG_FORCE_OS", os_name)
 
     cleanup_called = {"v": False}
 
@@ -1218,8 +1215,8 @@ def test_sandbox_launch_helpers(monkeypatch, tmp_path, system, expected):
         return subprocess.CompletedProcess(cmd, 0)
 
     monkeypatch.setattr(subprocess, "run", fake_run)
-    monkeypatch.setattr(platform, "system", lambda: system)
-    monkeypatch.setattr(shutil, "which", lambda cmd: cmd)
+    monkeypatch.setenv("EGG_FORCE_OS", system)
+    monkeypatch.setattr(sandboxer, "_which", lambda cmd: cmd)
 
     sandboxer.launch_microvm(tmp_path)
     sandboxer.launch_container(tmp_path)
@@ -1232,6 +1229,7 @@ def test_clean_removes_artifacts(monkeypatch, tmp_path, caplog):
     target_dir = tmp_path / "work"
     target_dir.mkdir()
     (target_dir / "precompute_hashes.yaml").write_text("{}")
+    (target_dir / "precompute_hashes.json").write_text("{}")
     (target_dir / "result.out").write_text("hi")
     (target_dir / "result.err").write_text("oops")
     sb = target_dir / "sandbox"
@@ -1244,6 +1242,7 @@ def test_clean_removes_artifacts(monkeypatch, tmp_path, caplog):
     egg_cli.main()
 
     assert not (target_dir / "precompute_hashes.yaml").exists()
+    assert not (target_dir / "precompute_hashes.json").exists()
     assert not (target_dir / "result.out").exists()
     assert not (target_dir / "result.err").exists()
     assert not sb.exists()
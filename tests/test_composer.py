@@ -140,15 +140,43 @@ cells:
     output = tmp_path / "demo.egg"
     output.write_bytes(b"old archive bytes")
 
-    original_writestr = zipfile.ZipFile.writestr
+    original_open = zipfile.ZipFile.open
 
-    def failing_writestr(self, *args, **kwargs):
-        raise RuntimeError("boom")
+    def failing_open(self, name, mode="r", *args, **kwargs):
+        if mode == "w":
+            raise RuntimeError("boom")
+        return original_open(self, name, mode, *args, **kwargs)
 
-    monkeypatch.setattr(zipfile.ZipFile, "writestr", failing_writestr)
+    monkeypatch.setattr(zipfile.ZipFile, "open", failing_open)
     with pytest.raises(RuntimeError, match="boom"):
         compose(manifest, output)
-    monkeypatch.setattr(zipfile.ZipFile, "writestr", original_writestr)
+    monkeypatch.setattr(zipfile.ZipFile, "open", original_open)
 
     assert output.read_bytes() == b"old archive bytes"
     assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_compose_signs_written_hashes_bytes(tmp_path: Path, monkeypatch) -> None:
+    import egg.composer as composer
+    from egg.hashing import verify_archive
+
+    (tmp_path / "code.py").write_text("print('hi')\n")
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(
+        "name: Example\ndescription: desc\n"
+        "cells:\n  - language: python\n    source: code.py\n"
+    )
+    signed = []
+    original = composer.sign_hashes
+
+    def record(data, **kwargs):
+        signed.append(data)
+        return original(data, **kwargs)
+
+    monkeypatch.setattr(composer, "sign_hashes", record)
+    output = tmp_path / "demo.egg"
+    compose(manifest, output)
+
+    with zipfile.ZipFile(output) as zf:
+        assert signed == [zf.read("hashes.yaml")]
+    assert verify_archive(output)
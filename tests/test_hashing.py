@@ -66,7 +66,7 @@ def test_compute_hashes_base_dir_not_parent(tmp_path: Path) -> None:
     foo.write_text("A")
     other = tmp_path / "other"
     other.mkdir()
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError, match="not within base_dir"):
         compute_hashes([foo], base_dir=other)
 
 
@@ -334,3 +334,121 @@ def test_load_hashes_empty_file(tmp_path: Path) -> None:
     path = tmp_path / "hashes.yaml"
     path.write_text("")
     assert load_hashes(path) == {}
+
+
+def test_signing_keys_are_cached() -> None:
+    """Derived keys should be reused instead of rebuilt per call."""
+    assert hashing._signing_key() is hashing._signing_key()
+    assert hashing._signing_key(b"k") is hashing._signing_key(b"k")
+    assert hashing._verify_key(b"k") is hashing._verify_key(b"k")
+
+
+def test_write_hashes_file_deterministic(tmp_path: Path) -> None:
+    """Plain entries are written sorted and identical to ``yaml.safe_dump``."""
+    import yaml
+
+    hashes = {
+        "runtime/dep.img": hashlib.sha256(b"b").hexdigest(),
+        "a.txt": hashlib.sha256(b"a").hexdigest(),
+    }
+    path = tmp_path / "hashes.yaml"
+    data = write_hashes_file(hashes, path)
+    assert data == path.read_bytes()
+    assert path.read_text() == yaml.safe_dump(hashes, sort_keys=True)
+    assert load_hashes(path) == hashes
+
+
+@pytest.mark.parametrize("length", [122, 123, 1100])
+def test_write_hashes_file_long_keys(tmp_path: Path, length: int) -> None:
+    """Long nested paths match ``yaml.safe_dump`` and still load."""
+    import yaml
+
+    key = ("deep/dir/" * 200)[: length - 4] + ".txt"
+    hashes = {key: hashlib.sha256(b"x").hexdigest(), "a.txt": "b" * 64}
+    path = tmp_path / "hashes.yaml"
+    write_hashes_file(hashes, path)
+    assert path.read_text() == yaml.safe_dump(hashes, sort_keys=True)
+    assert load_hashes(path) == hashes
+
+
+def test_write_hashes_file_quotes_ambiguous_entries(tmp_path: Path) -> None:
+    """Keys or digests YAML would not read as strings still round-trip."""
+    hashes = {"yes": "1" * 64, "1.txt": "a" * 64}
+    path = tmp_path / "hashes.yaml"
+    write_hashes_file(hashes, path)
+    assert load_hashes(path) == hashes
+
+
+def test_sign_hashes_accepts_bytes(tmp_path: Path) -> None:
+    """Signing raw bytes matches signing the equivalent file."""
+    data = tmp_path / "hashes.yaml"
+    data.write_text("a: 1\n")
+    assert sign_hashes(b"a: 1\n") == sign_hashes(data)
+
+
+@pytest.mark.parametrize(
+    "size", [0, 1, hashing._CHUNK_SIZE, hashing._CHUNK_SIZE * 3 + 1]
+)
+def test_sha256_file_sizes(tmp_path: Path, size: int) -> None:
+    """Digests match hashlib for files on both sides of the chunk size."""
+    data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+    f = tmp_path / "data.bin"
+    f.write_bytes(data)
+    assert sha256_file(f) == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("file_digest", [True, False])
+def test_sha256_file_large(monkeypatch, tmp_path: Path, file_digest: bool) -> None:
+    """Large files use ``file_digest`` or, before 3.11, the chunked loop."""
+    if not file_digest:
+        monkeypatch.setattr(hashing, "_file_digest", None)
+    data = b"y" * (hashing._CHUNK_SIZE * 2 + 5)
+    f = tmp_path / "data.bin"
+    f.write_bytes(data)
+    assert sha256_file(f) == hashlib.sha256(data).hexdigest()
+
+
+def test_duplicate_basenames_checked_before_hashing(
+    monkeypatch, tmp_path: Path
+) -> None:
+    """Duplicate keys are rejected before any file is hashed."""
+    one = tmp_path / "one"
+    two = tmp_path / "two"
+    one.mkdir()
+    two.mkdir()
+    (one / "dup.txt").write_text("A")
+    (two / "dup.txt").write_text("B")
+
+    def fail(path):  # pragma: no cover - should not be called
+        raise AssertionError("file hashed before duplicate check")
+
+    monkeypatch.setattr(hashing, "sha256_file", fail)
+    with pytest.raises(ValueError):
+        hashing.compute_hashes([one / "dup.txt", two / "dup.txt"])
+
+
+def test_verify_archive_reads_each_member_once(monkeypatch, tmp_path: Path) -> None:
+    """Verification streams every member a single time."""
+    output = tmp_path / "demo.egg"
+    key = b"member-once-key"
+    compose(
+        Path(__file__).resolve().parent.parent / "examples" / "manifest.yaml",
+        output,
+        dependencies=[],
+        private_key=key,
+    )
+    public = SigningKey(hashlib.sha256(key).digest()).verify_key.encode()
+
+    opened: list[str] = []
+    original_open = zipfile.ZipFile.open
+
+    def tracking_open(self, name, *args, **kwargs):
+        opened.append(getattr(name, "filename", name))
+        return original_open(self, name, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", tracking_open)
+
+    assert verify_archive(output, public_key=public)
+    assert sorted(opened) == sorted(set(opened))
+    with zipfile.ZipFile(output) as zf:
+        assert set(opened) == set(zf.namelist())
@@ -1,4 +1,6 @@
+import copy
 import os
+import pickle
 import sys
 from pathlib import Path
 
@@ -485,3 +487,82 @@ cells: []
     )
     with pytest.raises(ValueError, match="Duplicate dependency"):
         load_manifest(path)
+
+
+def test_cell_is_immutable_and_hashable() -> None:
+    cell = Cell(language="python", source="hello.py")
+    assert not hasattr(cell, "__dict__")
+    assert {cell, Cell(language="python", source="hello.py")} == {cell}
+    with pytest.raises(AttributeError):
+        cell.language = "r"  # type: ignore[misc]
+
+    manifest = Manifest(name="n", description="d", cells=[cell])
+    for clone in (
+        copy.copy(cell),
+        copy.deepcopy(cell),
+        pickle.loads(pickle.dumps(cell)),
+        copy.deepcopy(manifest).cells[0],
+    ):
+        assert clone == cell
+
+
+def test_load_manifest_reuses_parsed_yaml(monkeypatch, tmp_path: Path) -> None:
+    import egg.manifest as manifest_mod
+
+    (tmp_path / "hello.py").write_text("print('hi')\n")
+    (tmp_path / "other.py").write_text("print('other')\n")
+    path = tmp_path / "manifest.yaml"
+    path.write_text(
+        "name: Example\ndescription: desc\n"
+        "cells:\n  - language: python\n    source: hello.py\n"
+    )
+
+    calls = []
+    original_load = manifest_mod.yaml.load
+
+    def counting_load(*args, **kwargs):
+        calls.append(args)
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(manifest_mod.yaml, "load", counting_load)
+
+    first = load_manifest(path)
+    second = load_manifest(path)
+    assert first == second
+    assert len(calls) == 1
+
+    # Same size, different content: must be re-parsed.
+    path.write_text(
+        "name: Example\ndescription: desc\n"
+        "cells:\n  - language: python\n    source: other.py\n"
+    )
+    assert load_manifest(path).cells == [Cell(language="python", source="other.py")]
+    assert len(calls) == 2
+
+
+def test_manifest_dir_resolved_once(monkeypatch, tmp_path: Path) -> None:
+    path = tmp_path / "manifest.yaml"
+    path.write_text(
+        """
+name: Example
+description: desc
+cells:
+  - language: python
+    source: a.py
+  - language: python
+    source: b.py
+"""
+    )
+    resolved: list[Path] = []
+    original = Path.resolve
+
+    def tracking_resolve(self, *args, **kwargs):
+        resolved.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "resolve", tracking_resolve)
+    manifest = load_manifest(path)
+
+    assert [c.source for c in manifest.cells] == ["a.py", "b.py"]
+    # One resolve for the manifest path plus one per cell source.
+    assert len(resolved) == 3
@@ -8,7 +8,13 @@ import pytest
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 from egg.utils import get_lang_command  # noqa: E402
-from egg.precompute import precompute_cells, _hash_command  # noqa: E402
+import egg.precompute as precompute  # noqa: E402
+from egg.precompute import (  # noqa: E402
+    precompute_cells,
+    _hash_command,
+    _output_stamp,
+    _source_digest,
+)
 from egg.hashing import load_hashes, sha256_file  # noqa: E402
 import egg_cli  # noqa: E402
 
@@ -156,7 +162,9 @@ def test_precompute_caches_results(monkeypatch, tmp_path: Path) -> None:
     assert cache.is_file()
     first_hash = load_hashes(cache)["hello.py"]
     expected_cmd = get_lang_command("python")
-    assert first_hash == f"{sha256_file(src)}:{_hash_command(expected_cmd)}"
+    assert first_hash == (
+        f"{_source_digest(src)}:{_hash_command(expected_cmd)}:{_output_stamp(out_file)}"
+    )
     calls.clear()
 
     precompute_cells(manifest)
@@ -219,7 +227,11 @@ def test_precompute_cache_invalidated_on_command_change(
 
     cache = tmp_path / "precompute_hashes.yaml"
     new_hash = load_hashes(cache)["hello.py"]
-    expected = f"{sha256_file(src)}:{_hash_command(get_lang_command('python'))}"
+    out_file = src.with_name(src.name + ".out")
+    expected = (
+        f"{_source_digest(src)}:{_hash_command(get_lang_command('python'))}"
+        f":{_output_stamp(out_file)}"
+    )
     assert new_hash == expected
 
 
@@ -343,3 +355,168 @@ cells:
     out_file = tmp_path / "hello.dummy.out"
     assert outputs == [out_file]
     assert calls[0][0] == "dummycmd"
+
+
+def _write_two_cell_manifest(tmp_path: Path, first: str, second: str) -> Path:
+    (tmp_path / "a.py").write_text(first)
+    (tmp_path / "b.py").write_text(second)
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(
+        """
+name: Example
+description: desc
+cells:
+  - language: python
+    source: a.py
+  - language: python
+    source: b.py
+"""
+    )
+    return manifest
+
+
+def test_precompute_cells_multiple_cells(tmp_path: Path) -> None:
+    manifest = _write_two_cell_manifest(
+        tmp_path, "print('from a')\n", "print('from b')\n"
+    )
+
+    outputs = precompute_cells(manifest)
+
+    assert outputs == [tmp_path / "a.py.out", tmp_path / "b.py.out"]
+    assert outputs[0].read_text().strip() == "from a"
+    assert outputs[1].read_text().strip() == "from b"
+    assert not (tmp_path / "a.py.err").exists()
+    assert not (tmp_path / "b.py.err").exists()
+
+
+def test_precompute_cells_multiple_cells_failure(tmp_path: Path) -> None:
+    manifest = _write_two_cell_manifest(
+        tmp_path,
+        "print('ok')\n",
+        "import sys\nsys.stderr.write('boom')\nsys.exit(1)\n",
+    )
+
+    with pytest.raises(RuntimeError) as exc:
+        precompute_cells(manifest)
+
+    err_file = tmp_path / "b.py.err"
+    assert str(tmp_path / "b.py") in str(exc.value)
+    assert err_file.read_text() == "boom"
+    assert not (tmp_path / "a.py.err").exists()
+    # The successful cell is cached; the failed one is not.
+    assert set(load_hashes(tmp_path / "precompute_hashes.yaml")) == {"a.py"}
+
+
+def test_precompute_cells_run_in_parallel(monkeypatch, tmp_path: Path) -> None:
+    import threading
+
+    manifest = _write_two_cell_manifest(tmp_path, "print('a')\n", "print('b')\n")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_run(cmd, stdout=None, **kwargs):
+        # Both cells must be running at the same time to pass the barrier.
+        barrier.wait()
+        if stdout:
+            stdout.write(Path(cmd[-1]).name)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(shutil, "which", lambda c: c)
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    outputs = precompute_cells(manifest)
+    assert [p.read_text() for p in outputs] == ["a.py", "b.py"]
+
+
+def test_source_digest_falls_back_to_sha256(monkeypatch, tmp_path: Path) -> None:
+    src = tmp_path / "hello.py"
+    src.write_text("print('hi')\n")
+    monkeypatch.setattr(precompute, "HAVE_BLAKE3", False)
+    assert _source_digest(src) == sha256_file(src)
+
+
+def test_source_digest_blake3(tmp_path: Path) -> None:
+    blake3 = pytest.importorskip("blake3")
+    src = tmp_path / "hello.py"
+    src.write_bytes(b"print('hi')\n")
+    expected = blake3.blake3(b"print('hi')\n").hexdigest()
+    assert _source_digest(src) == f"blake3:{expected}"
+
+
+def test_precompute_cache_invalidated_on_output_change(
+    monkeypatch, tmp_path: Path
+) -> None:
+    src = tmp_path / "hello.py"
+    src.write_text("print('hi')\n")
+    manifest = _write_manifest(tmp_path / "manifest.yaml")
+
+    calls: list[list[str]] = []
+
+    def fake_run(cmd, stdout=None, **kwargs):
+        calls.append(cmd)
+        if stdout:
+            stdout.write("out\n")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(shutil, "which", lambda c: c)
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    precompute_cells(manifest)
+    calls.clear()
+
+    out_file = src.with_name(src.name + ".out")
+    out_file.write_text("")  # truncated output must not be trusted
+    precompute_cells(manifest)
+    assert len(calls) == 1
+    assert out_file.read_text() == "out\n"
+
+
+def test_precompute_resolves_each_language_once(monkeypatch, tmp_path: Path) -> None:
+    manifest = _write_two_cell_manifest(tmp_path, "print('a')\n", "print('b')\n")
+    lookups = []
+
+    def fake_which(cmd):
+        lookups.append(cmd)
+        return cmd
+
+    monkeypatch.setattr(shutil, "which", fake_which)
+
+    precompute_cells(manifest)
+    assert lookups == [sys.executable]
+
+
+def test_precompute_cache_sidecar(monkeypatch, tmp_path: Path) -> None:
+    src = tmp_path / "hello.py"
+    src.write_text("print('hi')\n")
+    manifest = _write_manifest(tmp_path / "manifest.yaml")
+    cache = tmp_path / "precompute_hashes.yaml"
+    sidecar = tmp_path / "precompute_hashes.json"
+
+    calls: list[list[str]] = []
+
+    def fake_run(cmd, stdout=None, **kwargs):
+        calls.append(cmd)
+        if stdout:
+            stdout.write("out\n")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(shutil, "which", lambda c: c)
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    precompute_cells(manifest)
+    assert sidecar.is_file()
+
+    def no_yaml(path):  # pragma: no cover - must not be reached
+        raise AssertionError("YAML cache parsed despite a current sidecar")
+
+    with monkeypatch.context() as m:
+        m.setattr(precompute, "load_hashes", no_yaml)
+        calls.clear()
+        precompute_cells(manifest)
+        assert calls == []
+
+    # Editing the YAML makes the sidecar stale, so the YAML wins.
+    cache.write_text("{}\n")
+    calls.clear()
+    precompute_cells(manifest)
+    assert len(calls) == 1
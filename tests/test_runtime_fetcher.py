@@ -6,6 +6,8 @@ import io
 import pytest
 import urllib.error
 import socket
+import gc
+import http.client
 import egg.runtime_fetcher as runtime_fetcher
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
@@ -521,3 +523,188 @@ dependencies:
 
     with pytest.raises(ValueError, match="EGG_DOWNLOAD_TIMEOUT"):
         fetch_runtime_blocks(manifest)
+
+
+def _start_keepalive_server(
+    files: dict[str, bytes], redirects: dict[str, str] | None = None
+):
+    """Return an HTTP/1.1 server recording each client connection."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import threading
+
+    connections: list[tuple[str, int]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_GET(self):
+            location = {"/moved.img": "/python%3A3.11.img", **(redirects or {})}
+            if self.path in location:
+                self.send_response(302)
+                self.send_header("Location", location[self.path])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = files.get(self.path)
+            if body is None:
+                self.send_error(404, "missing")
+                return
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("localhost", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread, connections
+
+
+def test_downloads_reuse_keepalive_connection(tmp_path: Path) -> None:
+    files = {"/python%3A3.11.img": b"py", "/r%3A4.3.img": b"r"}
+    server, thread, connections = _start_keepalive_server(files)
+    base = f"http://localhost:{server.server_address[1]}"
+    runtime_fetcher._POOL.clear()
+    try:
+        runtime_fetcher._download_container("python:3.11", tmp_path / "py.img", base)
+        runtime_fetcher._download_container("r:4.3", tmp_path / "r.img", base)
+        runtime_fetcher._download_container("moved", tmp_path / "mv.img", base)
+        # Revalidation answered with 304 keeps the file and the connection.
+        (tmp_path / "py.img").write_bytes(b"cached")
+        runtime_fetcher._download_container("python:3.11", tmp_path / "py.img", base)
+        with pytest.raises(RuntimeError, match="missing"):
+            runtime_fetcher._download_container("nope:1", tmp_path / "no.img", base)
+    finally:
+        runtime_fetcher._POOL.clear()
+        server.shutdown()
+        thread.join()
+
+    assert (tmp_path / "py.img").read_bytes() == b"cached"
+    assert (tmp_path / "r.img").read_bytes() == b"r"
+    assert (tmp_path / "mv.img").read_bytes() == b"py"
+    assert len(connections) == 1
+
+
+def test_malformed_reply_closes_connection(tmp_path: Path) -> None:
+    import threading
+    import warnings
+
+    server = socket.socket()
+    server.bind(("localhost", 0))
+    server.listen(1)
+
+    def serve() -> None:
+        conn, _ = server.accept()
+        with conn:
+            conn.recv(65536)
+            conn.sendall(b"GARBAGE\r\n\r\n")
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    port = server.getsockname()[1]
+    base = f"http://localhost:{port}"
+    runtime_fetcher._POOL.clear()
+    gc.collect()  # flush sockets leaked by earlier tests
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            with pytest.raises(http.client.BadStatusLine):
+                runtime_fetcher._download_container(
+                    "python:3.11", tmp_path / "py.img", base
+                )
+            gc.collect()
+    finally:
+        runtime_fetcher._POOL.clear()
+        thread.join(5)
+        server.close()
+    leaked = [
+        w
+        for w in caught
+        if issubclass(w.category, ResourceWarning) and f", {port})" in str(w.message)
+    ]
+    assert not leaked
+    assert not (tmp_path / "py.img").exists()
+
+
+def test_redirect_to_file_scheme_refused(tmp_path: Path) -> None:
+    secret = tmp_path / "secret.txt"
+    secret.write_bytes(b"local")
+    redirects = {"/escape.img": secret.as_uri()}
+    server, thread, _ = _start_keepalive_server({}, redirects)
+    base = f"http://localhost:{server.server_address[1]}"
+    runtime_fetcher._POOL.clear()
+    dest = tmp_path / "out" / "escape.img"
+    dest.parent.mkdir()
+    try:
+        with pytest.raises(RuntimeError, match="not allowed"):
+            runtime_fetcher._download_container("escape", dest, base)
+    finally:
+        runtime_fetcher._POOL.clear()
+        server.shutdown()
+        thread.join()
+    assert not dest.exists()
+    assert not dest.with_suffix(".tmp").exists()
+
+
+def test_container_downloads_run_concurrently(monkeypatch, tmp_path: Path) -> None:
+    import threading
+
+    (tmp_path / "local.txt").write_text("data")
+    monkeypatch.setenv("EGG_REGISTRY_URL", "http://example.com")
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(
+        """
+name: Example
+description: desc
+cells: []
+dependencies:
+  - python:3.11
+  - local.txt
+  - r:4.3
+"""
+    )
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_download(dep, dest, registry):
+        barrier.wait()  # both downloads must be in flight at once
+        dest.write_text(dep)
+        return dest
+
+    monkeypatch.setattr(runtime_fetcher, "_download_container", fake_download)
+
+    paths = fetch_runtime_blocks(manifest)
+    cache = tmp_path / ".egg_runtime"
+    assert paths == [
+        cache / "python_3.11.img",
+        tmp_path / "local.txt",
+        cache / "r_4.3.img",
+    ]
+
+
+def test_fetch_pool_shared_and_sized_from_env(monkeypatch) -> None:
+    monkeypatch.setattr(runtime_fetcher, "_FETCH_POOL", None)
+    monkeypatch.setenv("EGG_FETCH_WORKERS", "3")
+    pool = runtime_fetcher._fetch_pool()
+    try:
+        assert pool._max_workers == 3
+        assert runtime_fetcher._fetch_pool() is pool
+    finally:
+        pool.shutdown()
+
+    monkeypatch.setattr(runtime_fetcher, "_FETCH_POOL", None)
+    monkeypatch.setenv("EGG_FETCH_WORKERS", "many")
+    with pytest.raises(ValueError, match="EGG_FETCH_WORKERS"):
+        runtime_fetcher._fetch_pool()
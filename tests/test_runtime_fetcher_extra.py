@@ -74,3 +74,49 @@ def test_fetch_runtime_uses_manifest_dependency_loader(
     monkeypatch.setattr(rf, "load_manifest_dependencies", fake_loader)
     assert fetch_runtime_blocks(manifest) == []
     assert called == [manifest]
+
+
+@pytest.mark.parametrize(
+    "dep, valid",
+    [
+        ("python:3.11", True),
+        ("ghcr.io/org/img_1:tag", True),
+        (".hidden:1", True),
+        ("a//b:1", False),
+        ("./a:1", False),
+        ("a/../b:1", False),
+        ("/abs:1", False),
+    ],
+)
+def test_container_image_name_validation(
+    monkeypatch, tmp_path: Path, dep: str, valid: bool
+) -> None:
+    monkeypatch.delenv("EGG_REGISTRY_URL", raising=False)
+    manifest = base_manifest(tmp_path, f"\n  - '{dep}'")
+    if valid:
+        assert fetch_runtime_blocks(manifest) == [dep]
+    else:
+        with pytest.raises(ValueError, match="Invalid container image name"):
+            fetch_runtime_blocks(manifest)
+
+
+def test_fetch_local_dependencies_through_symlinks(tmp_path: Path) -> None:
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.img").write_text("x")
+    root = tmp_path / "root"
+    (root / "real").mkdir(parents=True)
+    (root / "real" / "a.img").write_text("a")
+    (root / "linkdir").symlink_to(root / "real")
+    (root / "link.img").symlink_to(root / "real" / "a.img")
+    (root / "escape_dir").symlink_to(outside)
+    (root / "escape.img").symlink_to(outside / "secret.img")
+
+    manifest = base_manifest(root, "\n  - linkdir/a.img\n  - link.img\n  - real/a.img")
+    expected = (root / "real" / "a.img").resolve()
+    assert fetch_runtime_blocks(manifest) == [expected] * 3
+
+    for dep in ("escape_dir/secret.img", "escape.img"):
+        manifest = base_manifest(root, f"\n  - {dep}")
+        with pytest.raises(ValueError, match="escapes manifest directory"):
+            fetch_runtime_blocks(manifest)
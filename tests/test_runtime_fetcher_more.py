@@ -259,6 +259,12 @@ def test_download_container_interrupted(monkeypatch, tmp_path: Path) -> None:
         rf._download_container("python:3.11", dest, "http://example.com")
 
     assert not dest.exists()
+    # The partial download is kept so the next attempt can resume it.
+    assert tmp.read_bytes() == b"partial"
+
+    with pytest.raises(RuntimeError):
+        rf._download_container("python:3.11", dest, "http://example.com", resume=False)
+    assert not dest.exists()
     assert not tmp.exists()
 
 
@@ -319,3 +325,327 @@ def test_download_container_hash_failure(monkeypatch, tmp_path: Path) -> None:
 
     assert not dest.exists()
     assert not tmp.exists()
+
+
+def test_download_container_reads_large_blocks(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "python.img"
+    payload = b"x" * (rf._DOWNLOAD_CHUNK_SIZE + 10)
+    sizes = []
+
+    class Resp:
+        def __init__(self) -> None:
+            self._io = io.BytesIO(payload)
+            self.headers = {"Content-Length": str(len(payload))}
+
+        def read(self, size=-1):
+            sizes.append(size)
+            return self._io.read(size)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+    monkeypatch.setattr(rf, "urlopen", lambda *a, **kw: Resp())
+    rf._download_container("python:3.11", dest, "http://example.com")
+
+    assert dest.read_bytes() == payload
+    assert sizes == [rf._DOWNLOAD_CHUNK_SIZE] * 3
+
+
+def test_download_container_keyboard_interrupt(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "python.img"
+    dest.write_bytes(b"old")
+
+    class Interrupted:
+        headers: dict = {}
+
+        def read(self, *args, **kwargs):
+            raise KeyboardInterrupt
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+    monkeypatch.setattr(rf, "urlopen", lambda *a, **kw: Interrupted())
+    with pytest.raises(KeyboardInterrupt):
+        rf._download_container("python:3.11", dest, "http://example.com")
+
+    assert dest.read_bytes() == b"old"
+    assert not dest.with_suffix(".tmp").exists()
+
+
+def test_download_container_revalidates_with_etag(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "python.img"
+
+    class Dummy(io.BytesIO):
+        def __init__(self, data: bytes, headers: dict) -> None:
+            super().__init__(data)
+            self.headers = headers
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+    requests: list[Request] = []
+    changed = False
+
+    def fake_urlopen(req, *, timeout=None):
+        requests.append(req)
+        if req.get_header("If-none-match") == '"v1"' and not changed:
+            raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+        return Dummy(b"image-v2" if changed else b"image-v1", {"ETag": '"v1"'})
+
+    monkeypatch.setattr(rf, "urlopen", fake_urlopen)
+
+    rf._download_container("python:3.11", dest, "http://example.com")
+    assert dest.read_bytes() == b"image-v1"
+    assert requests[0].get_header("If-none-match") is None
+    assert dest.with_suffix(".etag").is_file()
+
+    # Unchanged upstream: the 304 keeps the cached image.
+    assert rf._download_container("python:3.11", dest, "http://example.com") == dest
+    assert requests[1].get_header("If-none-match") == '"v1"'
+    assert dest.read_bytes() == b"image-v1"
+    assert not dest.with_suffix(".tmp").exists()
+
+    changed = True
+    rf._download_container("python:3.11", dest, "http://example.com")
+    assert dest.read_bytes() == b"image-v2"
+
+
+class _RangeResponse(io.BytesIO):
+    def __init__(self, data: bytes, status: int, headers: dict) -> None:
+        super().__init__(data)
+        self.status = status
+        self.headers = headers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def test_download_container_resume(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "python.img"
+    tmp = dest.with_suffix(".tmp")
+    tmp.write_bytes(b"AAAA")
+    rf._save_range_validator(tmp, {"ETag": '"v1"'})
+    ranges = []
+
+    def fake_urlopen(req, *, timeout=None):
+        ranges.append((req.get_header("Range"), req.get_header("If-range")))
+        return _RangeResponse(
+            b"BBBB",
+            206,
+            {"Content-Length": "4", "Content-Range": "bytes 4-7/8"},
+        )
+
+    monkeypatch.setattr(rf, "urlopen", fake_urlopen)
+    digest = hashlib.sha256(b"AAAABBBB").hexdigest()
+    rf._download_container(
+        "python:3.11", dest, "http://example.com", expected_digest=digest
+    )
+
+    assert ranges == [("bytes=4-", '"v1"')]
+    assert dest.read_bytes() == b"AAAABBBB"
+    assert not tmp.exists()
+    assert not rf._range_validator_path(tmp).exists()
+
+
+def test_download_container_no_resume_without_validator(
+    monkeypatch, tmp_path: Path
+) -> None:
+    dest = tmp_path / "python.img"
+    tmp = dest.with_suffix(".tmp")
+    tmp.write_bytes(b"AAAA")
+    ranges = []
+
+    def fake_urlopen(req, *, timeout=None):
+        ranges.append(req.get_header("Range"))
+        return _RangeResponse(b"new!", 200, {"Content-Length": "4"})
+
+    monkeypatch.setattr(rf, "urlopen", fake_urlopen)
+    rf._download_container("python:3.11", dest, "http://example.com")
+    assert ranges == [None]
+    assert dest.read_bytes() == b"new!"
+
+
+@pytest.mark.parametrize(
+    "content_range", ["bytes 0-3/8", None], ids=["wrong-start", "missing"]
+)
+def test_download_container_mismatched_partial_response(
+    monkeypatch, tmp_path: Path, content_range: str | None
+) -> None:
+    dest = tmp_path / "python.img"
+    tmp = dest.with_suffix(".tmp")
+    tmp.write_bytes(b"AAAA")
+    rf._save_range_validator(tmp, {"ETag": '"v1"'})
+    headers = {"Content-Length": "4"}
+    if content_range is not None:
+        headers["Content-Range"] = content_range
+
+    monkeypatch.setattr(
+        rf, "urlopen", lambda *a, **kw: _RangeResponse(b"XXXX", 206, headers)
+    )
+    with pytest.raises(RuntimeError, match="Unexpected partial response"):
+        rf._download_container("python:3.11", dest, "http://example.com")
+    assert not dest.exists()
+    assert not tmp.exists()
+    assert not rf._range_validator_path(tmp).exists()
+
+
+def test_download_container_resume_ignored_by_server(
+    monkeypatch, tmp_path: Path
+) -> None:
+    dest = tmp_path / "python.img"
+    tmp = dest.with_suffix(".tmp")
+    tmp.write_bytes(b"stale")
+
+    monkeypatch.setattr(
+        rf,
+        "urlopen",
+        lambda *a, **kw: _RangeResponse(b"full", 200, {"Content-Length": "4"}),
+    )
+    rf._download_container("python:3.11", dest, "http://example.com")
+    assert dest.read_bytes() == b"full"
+
+
+def test_download_container_resume_not_satisfiable(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "python.img"
+    tmp = dest.with_suffix(".tmp")
+    tmp.write_bytes(b"too long")
+    rf._save_range_validator(tmp, {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    ranges = []
+
+    def fake_urlopen(req, *, timeout=None):
+        ranges.append(req.get_header("Range"))
+        if req.get_header("Range"):
+            raise urllib.error.HTTPError(req.full_url, 416, "Range", {}, None)
+        return _RangeResponse(b"full", 200, {})
+
+    monkeypatch.setattr(rf, "urlopen", fake_urlopen)
+    rf._download_container("python:3.11", dest, "http://example.com")
+    assert ranges == ["bytes=8-", None]
+    assert dest.read_bytes() == b"full"
+
+
+def test_download_container_dedup(monkeypatch, tmp_path: Path) -> None:
+    import threading
+
+    dest = tmp_path / "python.img"
+    release = threading.Event()
+    calls = []
+
+    def fake_urlopen(req, *, timeout=None):
+        calls.append(req.full_url)
+        assert release.wait(5)
+        return _RangeResponse(b"image", 200, {})
+
+    waiting = threading.Semaphore(0)
+
+    class CountingFuture(rf.Future):
+        def result(self, timeout=None):
+            waiting.release()
+            return super().result(timeout)
+
+    monkeypatch.setattr(rf, "urlopen", fake_urlopen)
+    monkeypatch.setattr(rf, "Future", CountingFuture)
+
+    results: list[Path] = []
+
+    def worker() -> None:
+        results.append(
+            rf._download_container("python:3.11", dest, "http://example.com")
+        )
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for t in threads:
+        t.start()
+    # Hold the download until the nine other callers are waiting on it.
+    for _ in range(9):
+        assert waiting.acquire(timeout=5)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == ["http://example.com/python%3A3.11.img"]
+    assert results == [dest] * 10
+    assert dest.read_bytes() == b"image"
+    assert not rf._INFLIGHT
+
+
+def test_download_container_serializes_same_dest(monkeypatch, tmp_path: Path) -> None:
+    import threading
+
+    dest = tmp_path / "python.img"
+    data = b"image"
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_urlopen(req, *, timeout=None):
+        calls.append(req.full_url)
+        started.set()
+        assert release.wait(5)
+        return _RangeResponse(data, 200, {})
+
+    waiting = threading.Semaphore(0)
+    real_wait = rf.wait
+
+    def counting_wait(futures):
+        waiting.release()
+        return real_wait(futures)
+
+    monkeypatch.setattr(rf, "urlopen", fake_urlopen)
+    monkeypatch.setattr(rf, "wait", counting_wait)
+
+    first = threading.Thread(
+        target=rf._download_container, args=("python:3.11", dest, "http://a")
+    )
+    first.start()
+    assert started.wait(5)
+    digest = hashlib.sha256(data).hexdigest()
+    results: list[Path] = []
+    second = threading.Thread(
+        target=lambda: results.append(
+            rf._download_container(
+                "python:3.11", dest, "http://b", expected_digest=digest
+            )
+        )
+    )
+    second.start()
+    # The second caller differs in registry and digest but must still wait.
+    assert waiting.acquire(timeout=5)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    # Once the first download lands, the second finds a verified cached file.
+    assert calls == ["http://a/python%3A3.11.img"]
+    assert results == [dest]
+    assert not rf._INFLIGHT
+
+
+@pytest.mark.parametrize(
+    "image",
+    [
+        "library/python:3.11",
+        "ghcr.io/org/img@sha256:abc",
+        "r:4.3+cran",
+        "tilde~name:1",
+        "odd name:1",
+        "pct%:1",
+        "ünïcode:1",
+    ],
+)
+def test_quote_image_matches_quote(image: str) -> None:
+    from urllib.parse import quote
+
+    assert rf._quote_image(image) == quote(image)
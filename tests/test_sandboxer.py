@@ -1,19 +1,29 @@
 import os
 import sys
-import shutil
 from pathlib import Path
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 from egg.manifest import Manifest, Cell  # noqa: E402
 from egg.sandboxer import launch_container  # noqa: E402
-import importlib
-import platform
 
 
 import pytest
 
 
+@pytest.fixture(scope="module")
+def py_r_manifest() -> Manifest:
+    """Manifest with python and R cells, shared by the parametrized cases."""
+    return Manifest(
+        name="Example",
+        description="desc",
+        cells=[
+            Cell(language="python", source="hello.py"),
+            Cell(language="r", source="hello.R"),
+        ],
+    )
+
+
 @pytest.mark.parametrize(
     "os_name,conf_file",
     [
@@ -23,24 +33,17 @@ import pytest
     ],
 )
 def test_prepare_images_writes_config(
-    monkeypatch, tmp_path: Path, os_name: str, conf_file: str
+    monkeypatch,
+    tmp_path: Path,
+    py_r_manifest: Manifest,
+    os_name: str,
+    conf_file: str,
 ) -> None:
-
-    monkeypatch.setattr(platform, "system", lambda: os_name)
     import egg.sandboxer as sb
 
-    importlib.reload(sb)
+    monkeypatch.setenv("EGG_FORCE_OS", os_name)
 
-    manifest = Manifest(
-        name="Example",
-        description="desc",
-        cells=[
-            Cell(language="python", source="hello.py"),
-            Cell(language="r", source="hello.R"),
-        ],
-    )
-
-    images, cleanup = sb.prepare_images(manifest, tmp_path)
+    images, cleanup = sb.prepare_images(py_r_manifest, tmp_path)
     cleanup()
 
     assert set(images.keys()) == {"python", "r"}
@@ -77,8 +80,10 @@ def test_launch_container_corrupt_config(
 def test_launch_container_missing_runtime(
     monkeypatch, tmp_path: Path, os_name: str, runtime: str
 ) -> None:
+    import egg.sandboxer as sb
+
     (tmp_path / "container.json").write_text('{"language": "python"}')
-    monkeypatch.setattr(platform, "system", lambda: os_name)
-    monkeypatch.setattr(shutil, "which", lambda _: None)
+    monkeypatch.setenv("EGG_FORCE_OS", os_name)
+    monkeypatch.setattr(sb, "_which", lambda _: None)
     with pytest.raises(FileNotFoundError, match=runtime):
         launch_container(tmp_path)
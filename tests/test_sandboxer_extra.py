@@ -3,7 +3,6 @@ import sys
 from pathlib import Path
 import subprocess
 import tempfile
-import platform
 import shutil
 import pytest  # noqa: F401
 
@@ -17,6 +16,7 @@ from egg.sandboxer import (
     prepare_images,
 )  # noqa: E402
 from egg.manifest import Manifest, Cell  # noqa: E402
+import egg.sandboxer as sb  # noqa: E402
 
 
 def test_build_microvm_image(tmp_path: Path) -> None:
@@ -28,6 +28,12 @@ def test_build_microvm_image(tmp_path: Path) -> None:
     assert (tmp_path / "rootfs.ext4").is_file()
 
 
+def test_build_microvm_image_rebuild_zeroes_rootfs(tmp_path: Path) -> None:
+    (tmp_path / "rootfs.ext4").write_bytes(b"stale" * 10)
+    build_microvm_image("python", tmp_path)
+    assert (tmp_path / "rootfs.ext4").read_bytes() == bytes(1024 * 1024)
+
+
 def test_launch_microvm(monkeypatch, tmp_path: Path):
     (tmp_path / "microvm.json").write_text("{}")
     called = []
@@ -57,8 +63,8 @@ def test_launch_container(monkeypatch, tmp_path: Path):
         return subprocess.CompletedProcess(cmd, 0)
 
     monkeypatch.setattr(subprocess, "run", fake_run)
-    monkeypatch.setattr(platform, "system", lambda: "Linux")
-    monkeypatch.setattr(shutil, "which", lambda _: "/usr/bin/runc")
+    monkeypatch.setenv("EGG_FORCE_OS", "Linux")
+    monkeypatch.setattr(sb, "_which", lambda _: "/usr/bin/runc")
     result = launch_container(tmp_path)
     assert called and "runc" in called[0][0]
     assert result.returncode == 0
@@ -71,22 +77,22 @@ def test_prepare_images_uses_tempdir(monkeypatch, tmp_path: Path):
         cells=[Cell(language="python", source="a.py")],
     )
 
-    class DummyTempDir:
-        def __init__(self):
-            self.name = str(tmp_path / "tmp")
-            Path(self.name).mkdir()
-            self.cleaned = False
+    tmp = tmp_path / "tmp"
+    removed = []
 
-        def cleanup(self):
-            self.cleaned = True
+    def fake_mkdtemp(prefix=None):
+        tmp.mkdir()
+        return str(tmp)
 
-    dummy = DummyTempDir()
-    monkeypatch.setattr(tempfile, "TemporaryDirectory", lambda: dummy)
+    monkeypatch.setattr(tempfile, "mkdtemp", fake_mkdtemp)
+    monkeypatch.setattr(
+        shutil, "rmtree", lambda path, ignore_errors=False: removed.append(path)
+    )
 
     images, cleanup = prepare_images(manifest, None)
-    assert images["python"].parent == Path(dummy.name)
+    assert images["python"].parent == tmp
     cleanup()
-    assert dummy.cleaned
+    assert removed == [str(tmp)]
 
 
 def test_prepare_images_skips_duplicate(tmp_path: Path):
@@ -116,12 +122,32 @@ def test_prepare_images_tempdir_cleanup(tmp_path: Path):
     assert not base.exists()
 
 
-def test_check_platform_unsupported(monkeypatch):
-    import importlib
-    import egg.sandboxer as sb
+def test_prepare_images_tempdir_removed_on_failure(monkeypatch, tmp_path: Path):
+    manifest = Manifest(
+        name="ex",
+        description="d",
+        cells=[Cell(language="python", source="a.py")],
+    )
+    tmp = tmp_path / "tmp"
+
+    def fake_mkdtemp(prefix=None):
+        tmp.mkdir()
+        return str(tmp)
+
+    def fail(lang, dest):
+        dest.mkdir()
+        raise OSError("disk full")
+
+    monkeypatch.setenv("EGG_FORCE_OS", "Linux")
+    monkeypatch.setattr(tempfile, "mkdtemp", fake_mkdtemp)
+    monkeypatch.setattr(sb, "build_microvm_image", fail)
+    with pytest.raises(OSError, match="disk full"):
+        prepare_images(manifest)
+    assert not tmp.exists()
+
 
-    monkeypatch.setattr(sb.platform, "system", lambda: "Unknown")
-    sb = importlib.reload(sb)
+def test_check_platform_unsupported(monkeypatch):
+    monkeypatch.setenv("EGG_FORCE_OS", "Unknown")
     with pytest.raises(RuntimeError, match="Unsupported platform"):
         sb.check_platform()
 
@@ -150,8 +176,8 @@ def test_launch_microvm_nonzero_exit(monkeypatch, tmp_path: Path):
 
 def test_launch_container_missing_binary(monkeypatch, tmp_path: Path):
     (tmp_path / "container.json").write_text('{"language": "python"}')
-    monkeypatch.setattr(platform, "system", lambda: "Linux")
-    monkeypatch.setattr(shutil, "which", lambda _: "/fake/runc")
+    monkeypatch.setenv("EGG_FORCE_OS", "Linux")
+    monkeypatch.setattr(sb, "_which", lambda _: "/fake/runc")
 
     def fake_run(cmd, check=True):
         raise FileNotFoundError("no such file or directory")
@@ -163,8 +189,8 @@ def test_launch_container_missing_binary(monkeypatch, tmp_path: Path):
 
 def test_launch_container_nonzero_exit(monkeypatch, tmp_path: Path):
     (tmp_path / "container.json").write_text('{"language": "python"}')
-    monkeypatch.setattr(platform, "system", lambda: "Linux")
-    monkeypatch.setattr(shutil, "which", lambda _: "/usr/bin/runc")
+    monkeypatch.setenv("EGG_FORCE_OS", "Linux")
+    monkeypatch.setattr(sb, "_which", lambda _: "/usr/bin/runc")
 
     def fake_run(cmd, check=True):
         raise subprocess.CalledProcessError(2, cmd)
@@ -172,3 +198,48 @@ def test_launch_container_nonzero_exit(monkeypatch, tmp_path: Path):
     monkeypatch.setattr(subprocess, "run", fake_run)
     with pytest.raises(RuntimeError, match="non-zero status 2"):
         launch_container(tmp_path)
+
+
+def test_prepare_images_builds_in_parallel(monkeypatch, tmp_path: Path):
+    import threading
+
+    manifest = Manifest(
+        name="ex",
+        description="d",
+        cells=[
+            Cell(language="python", source="a.py"),
+            Cell(language="r", source="b.R"),
+            Cell(language="Python", source="c.py"),
+        ],
+    )
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_build(lang, dest):
+        barrier.wait()  # both languages must be building at once
+        dest.mkdir(parents=True)
+
+    monkeypatch.setenv("EGG_FORCE_OS", "Darwin")
+    monkeypatch.setattr(sb, "build_container_image", fake_build)
+
+    images, cleanup = prepare_images(manifest, tmp_path)
+    assert list(images) == ["python", "r"]
+    assert images["r"] == tmp_path / "r-image"
+    cleanup()
+
+
+def test_which_caches_hits_only(monkeypatch):
+    lookups = []
+    found = {}
+
+    def fake_which(name):
+        lookups.append(name)
+        return found.get(name)
+
+    monkeypatch.setattr(shutil, "which", fake_which)
+    monkeypatch.setattr(sb, "_WHICH_CACHE", {})
+
+    assert sb._which("runc") is None
+    found["runc"] = "/usr/bin/runc"
+    assert sb._which("runc") == "/usr/bin/runc"
+    assert sb._which("runc") == "/usr/bin/runc"
+    assert lookups == ["runc", "runc"]
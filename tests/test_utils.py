@@ -123,3 +123,52 @@ def test_is_relative_to_outside(tmp_path: Path) -> None:
     base = tmp_path / "base"
     other = tmp_path / "other" / "z.txt"
     assert not utils._is_relative_to(other, base)
+
+
+@pytest.mark.parametrize(
+    "path, base, expected",
+    [
+        ("/a/b", "/a/b", True),
+        ("/a/bc", "/a/b", False),
+        ("/a/b/c", "/", True),
+        ("/a/../b", "/a", True),
+        ("x/y", "x", True),
+        ("x/y", ".", True),
+        ("/x/y", "x", False),
+    ],
+)
+def test_is_relative_to_matches_pathlib(path: str, base: str, expected: bool) -> None:
+    assert utils._is_relative_to(Path(path), Path(base)) is expected
+
+
+def test_get_lang_command_override_cached(monkeypatch):
+    utils._parse_lang_override.cache_clear()
+    monkeypatch.setenv("EGG_CMD_BASH", "/custom/bash -e")
+    first = utils.get_lang_command("bash")
+    second = utils.get_lang_command("bash")
+    assert first == second == ["/custom/bash", "-e"]
+    assert first is not second
+    assert utils._parse_lang_override.cache_info().hits == 1
+
+    monkeypatch.setenv("EGG_CMD_BASH", "/other/bash")
+    assert utils.get_lang_command("bash") == ["/other/bash"]
+
+
+@pytest.mark.parametrize("backend", ["orjson", "ujson", "json"])
+def test_json_helpers_round_trip(monkeypatch, backend: str) -> None:
+    if backend != "json":
+        module = pytest.importorskip(backend)
+    if backend != "orjson":
+        monkeypatch.setattr(utils, "_orjson", None)
+    if backend == "ujson":
+        monkeypatch.setattr(utils, "_ujson", module)
+    elif backend == "json":
+        monkeypatch.setattr(utils, "_ujson", None)
+
+    data = {"etag": '"abc"', "hashes": {"a.py": "ü"}, "version": 1}
+    encoded = utils.json_dumps(data)
+    assert isinstance(encoded, bytes)
+    assert utils.json_loads(encoded) == data
+    assert utils.json_loads(encoded.decode("utf-8")) == data
+    with pytest.raises(ValueError):
+        utils.json_loads(b"{not json")